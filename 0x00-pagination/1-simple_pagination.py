@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """This module provides a helper function for pagination.
 """
-import csv
 import math
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+from dataset_loader import shared_dataset
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -19,17 +20,15 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
         self.__dataset = None
+        self.__backend = backend
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List]:
         """Cached dataset
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            self.__dataset = shared_dataset(self.DATA_FILE, self.__backend)
 
         return self.__dataset
 
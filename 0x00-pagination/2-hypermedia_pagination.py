@@ -2,8 +2,16 @@
 """This module provides a helper function for pagination.
 """
 import csv
+import io
+import json
 import math
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+from columnar_dataset import COLUMNS
+from dataset_loader import shared_dataset
+from secondary_index import SecondaryIndex, filter_key
+from sorted_index import SortedViews
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -19,42 +27,103 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
         self.__dataset = None
+        self.__backend = backend
+        self.__index = None
+        self.__views = SortedViews()
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List]:
         """Cached dataset
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            self.__dataset = shared_dataset(self.DATA_FILE, self.__backend)
 
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+    def filtered(self, filters: Dict = None,
+                 sort_by: str = None) -> Sequence[List]:
+        """Rows matching filters such as {"year": 2016, "gender": "MALE"},
+           looked up in an index on the categorical columns, optionally
+           ordered by a column ("count", or "-count" for descending).
+        """
+        rows = self.dataset()
+        if filters:
+            if self.__index is None:
+                self.__index = SecondaryIndex(rows)
+            rows = self.__index.select(filters)
+        if sort_by:
+            rows = self.__views.view(rows, sort_by, filter_key(filters))
+        return rows
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Dict = None, sort_by: str = None) -> List[List]:
         """Retrieves a specified page of data from the dataset.
         """
         assert type(page) == int and type(page_size) == int
         assert page > 0 and page_size > 0
         start_idx, end_idx = index_range(page, page_size)
-        full_data = self.dataset()
+        full_data = self.filtered(filters, sort_by)
         if start_idx > len(full_data):
             return []
         return full_data[start_idx:end_idx]
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict:
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  filters: Dict = None, sort_by: str = None) -> Dict:
         """Retrieves information about a specific page.
         """
-        full_data = self.get_page(page, page_size)
+        full_data = self.get_page(page, page_size, filters, sort_by)
+        total = len(self.filtered(filters, sort_by))
         start_idx, end_idx = index_range(page, page_size)
-        total_num_of_pages = math.ceil(len(self.__dataset) / page_size)
+        total_num_of_pages = math.ceil(total / page_size)
         return {
             'page_size': len(full_data),
             'page': page,
             'data': full_data,
-            'next_page': page + 1 if end_idx < len(self.__dataset) else None,
+            'next_page': page + 1 if end_idx < total else None,
             'prev_page': page - 1 if start_idx > 0 else None,
             'total_pages': total_num_of_pages
         }
+
+    def iter_rows(self, start: int = 0, stop: int = None,
+                  filters: Dict = None,
+                  sort_by: str = None) -> Iterator[List]:
+        """Yields rows start..stop one at a time, building each row only
+           when it is reached.
+        """
+        rows = self.filtered(filters, sort_by)
+        stop = len(rows) if stop is None else min(stop, len(rows))
+        for i in range(max(start, 0), stop):
+            yield rows[i]
+
+    def iter_pages(self, page_size: int = 10, filters: Dict = None,
+                   sort_by: str = None,
+                   fmt: str = None) -> Iterator[Union[List[List], str]]:
+        """Yields every page in order, holding one page at a time. With
+           fmt="csv" or fmt="ndjson" each page is yielded as a text chunk
+           instead, the CSV stream starting with the source file's header
+           line.
+        """
+        assert type(page_size) == int and page_size > 0
+        assert fmt in (None, "csv", "ndjson")
+        rows = self.iter_rows(filters=filters, sort_by=sort_by)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if fmt == "csv":
+            writer.writerow(self.dataset().header)
+        while True:
+            page = list(islice(rows, page_size))
+            if not page:
+                break
+            if fmt is None:
+                yield page
+                continue
+            if fmt == "csv":
+                writer.writerows(page)
+            else:
+                for row in page:
+                    buffer.write(json.dumps(dict(zip(COLUMNS, row))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
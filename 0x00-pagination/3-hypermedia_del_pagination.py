@@ -2,9 +2,12 @@
 """Task 3: Deletion-resilient hypermedia pagination
 """
 
-import csv
 import math
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+from dataset_loader import shared_dataset
+from indexed_dataset import IndexedDataset
+from sorted_index import SortedIndex, decode_cursor, encode_cursor
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -18,18 +21,19 @@ class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    CURSOR_KEY = ("year", "rank", "name")
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
         self.__dataset = None
+        self.__backend = backend
+        self.__indexed_dataset = None
+        self.__cursor_index = None
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List]:
         """Cached dataset
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            self.__dataset = shared_dataset(self.DATA_FILE, self.__backend)
 
         return self.__dataset
 
@@ -44,23 +48,23 @@ class Server:
             return []
         return data[start:end]
 
+    def indexed_dataset(self) -> IndexedDataset:
+        """Dataset indexed by sorting position, starting at 0
+        """
+        if self.__indexed_dataset is None:
+            self.__indexed_dataset = IndexedDataset(self.dataset())
+        return self.__indexed_dataset
+
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """Provides page data and metadata starting from a specific index.
         """
         full_data = self.indexed_dataset()
-        assert index is not None and index >= 0 and index <= max(full_data.keys())
-        page_data = []
-        data_count = 0
-        next_index = None
-        start_idx = index if index else 0
-        for i, item in full_data.items():
-            if i >= start_idx and data_count < page_size:
-                page_data.append(item)
-                data_count += 1
-                continue
-            if data_count == page_size:
-                next_index = i
-                break
+        max_index = full_data.max_key()
+        assert index is not None and max_index is not None
+        assert 0 <= index <= max_index
+        keys = full_data.keys_from(index, page_size + 1)
+        page_data = [full_data[i] for i in keys[:page_size]]
+        next_index = keys[page_size] if len(keys) > page_size else None
         page_info = {
             'index': index,
             'next_index': next_index,
@@ -68,3 +72,32 @@ class Server:
             'data': page_data,
         }
         return page_info
+
+    def get_after(self, cursor: str = None, limit: int = 10) -> Dict:
+        """Provides the rows that follow an opaque cursor in CURSOR_KEY
+           order. Deleted rows are skipped, so a cursor keeps its place
+           when the dataset changes between calls.
+        """
+        assert type(limit) == int and limit > 0
+        full_data = self.indexed_dataset()
+        if self.__cursor_index is None:
+            self.__cursor_index = SortedIndex(self.dataset(), self.CURSOR_KEY)
+        index = self.__cursor_index
+        key = None if cursor is None else decode_cursor(index.columns, cursor)
+        positions = []
+        for position in index.iter_after(key):
+            if position in full_data:
+                positions.append(position)
+                if len(positions) > limit:
+                    break
+        next_cursor = None
+        if len(positions) > limit:
+            last_key = index.key(positions[limit - 1])
+            next_cursor = encode_cursor(index.columns, last_key)
+        page_data = [full_data[i] for i in positions[:limit]]
+        return {
+            'cursor': cursor,
+            'next_cursor': next_cursor,
+            'page_size': len(page_data),
+            'data': page_data,
+        }
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Asyncio front end for the pagination servers.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
+
+from dataset_loader import shared_dataset
+from indexed_dataset import IndexedDataset
+
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+IndexServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class AsyncServer:
+    """Serves get_page, get_hyper and get_hyper_index to coroutines.
+       Both underlying servers read the same shared dataset. Its first
+       load runs once in the default executor, and every request that
+       arrives during it awaits that load. So does the build of the
+       index behind get_hyper_index.
+
+       Plain page requests then run on the event loop, since each
+       touches only one page of rows. Filtered or sorted requests may
+       have to build an index or a sorted view over the whole dataset,
+       so they run on a single worker thread of their own. It keeps
+       them off the loop and builds each view once, one at a time.
+    """
+
+    def __init__(self, backend: str = "columnar"):
+        self.__backend = backend
+        self.__hyper = HyperServer(backend)
+        self.__index = IndexServer(backend)
+        self.__loading = None
+        self.__indexing = None
+        self.__views = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sorted-views")
+
+    async def dataset(self) -> Sequence[List]:
+        """Shared dataset, loaded off the event loop on first use.
+        """
+        if self.__loading is None:
+            loop = asyncio.get_running_loop()
+            self.__loading = loop.run_in_executor(
+                None, shared_dataset, IndexServer.DATA_FILE, self.__backend)
+        try:
+            return await asyncio.shield(self.__loading)
+        except Exception:
+            self.__loading = None
+            raise
+
+    async def indexed_dataset(self) -> IndexedDataset:
+        """Dataset indexed by sorting position, built off the event
+           loop on first use.
+        """
+        await self.dataset()
+        if self.__indexing is None:
+            loop = asyncio.get_running_loop()
+            self.__indexing = loop.run_in_executor(
+                None, self.__index.indexed_dataset)
+        try:
+            return await asyncio.shield(self.__indexing)
+        except Exception:
+            self.__indexing = None
+            raise
+
+    async def __on_views(self, method, *args):
+        """Runs a filtered or sorted request on the views thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__views, method, *args)
+
+    async def get_page(self, page: int = 1, page_size: int = 10,
+                       filters: Dict = None,
+                       sort_by: str = None) -> List[List]:
+        """Retrieves a specified page of data from the dataset.
+        """
+        await self.dataset()
+        if filters or sort_by:
+            return await self.__on_views(self.__hyper.get_page, page,
+                                         page_size, filters, sort_by)
+        return self.__hyper.get_page(page, page_size)
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10,
+                        filters: Dict = None, sort_by: str = None) -> Dict:
+        """Retrieves information about a specific page.
+        """
+        await self.dataset()
+        if filters or sort_by:
+            return await self.__on_views(self.__hyper.get_hyper, page,
+                                         page_size, filters, sort_by)
+        return self.__hyper.get_hyper(page, page_size)
+
+    async def get_hyper_index(self, index: int = None,
+                              page_size: int = 10) -> Dict:
+        """Provides page data and metadata starting from a specific index.
+        """
+        await self.indexed_dataset()
+        return self.__index.get_hyper_index(index, page_size)
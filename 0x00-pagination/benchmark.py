@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Latency benchmark for the pagination servers.
+
+Generates synthetic baby-name datasets of the requested sizes, then for
+each storage backend replays a set of access patterns in a fresh
+process and reports p50/p99 latency, throughput and peak RSS:
+
+    python3 benchmark.py --rows 19418,1000000,10000000 --json baseline.json
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from dataset_loader import BACKENDS
+
+
+index_range = __import__('0-simple_helper_function').index_range
+HyperServer = __import__('2-hypermedia_pagination').Server
+IndexServer = __import__('3-hypermedia_del_pagination').Server
+
+GENDERS = ("FEMALE", "MALE")
+ETHNICITIES = ("ASIAN AND PACIFIC ISLANDER", "BLACK NON HISPANIC",
+               "HISPANIC", "WHITE NON HISPANIC")
+PAGE_SIZE = 20
+
+
+def write_dataset(path: str, rows: int, seed: int = 0) -> None:
+    """Writes a CSV with the baby-names layout and rows random rows.
+    """
+    rng = random.Random(seed)
+    names = ["Name{}".format(i) for i in range(5000)]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["Year of Birth", "Gender", "Ethnicity",
+                         "Child's First Name", "Count", "Rank"])
+        for _ in range(rows):
+            writer.writerow([rng.randint(2011, 2016), rng.choice(GENDERS),
+                             rng.choice(ETHNICITIES), rng.choice(names),
+                             rng.randint(10, 500), rng.randint(1, 100)])
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples.
+    """
+    rank = max(int(round(fraction * len(samples))) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def measure(operations: List[Callable[[], object]]) -> Dict[str, float]:
+    """Times each operation and summarises the latencies.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for operation in operations:
+        began = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def run_backend(path: str, backend: str, ops: int, seed: int) -> Dict:
+    """Replays every access pattern against one backend. Meant to run in
+       its own process so that peak RSS belongs to this backend alone.
+    """
+    rng = random.Random(seed)
+    hyper_server = type("BenchHyperServer", (HyperServer,),
+                        {"DATA_FILE": path})(backend)
+    index_server = type("BenchIndexServer", (IndexServer,),
+                        {"DATA_FILE": path})(backend)
+    began = time.perf_counter()
+    rows = len(hyper_server.dataset())
+    load_s = time.perf_counter() - began
+    pages = max(rows // PAGE_SIZE, 1)
+
+    results = {"load_s": load_s}
+    results["index_range"] = measure(
+        [lambda p=rng.randint(1, pages): index_range(p, PAGE_SIZE)
+         for _ in range(ops)])
+    results["sequential_get_page"] = measure(
+        [lambda p=(i % pages) + 1: hyper_server.get_page(p, PAGE_SIZE)
+         for i in range(ops)])
+    results["random_get_page"] = measure(
+        [lambda p=rng.randint(1, pages): hyper_server.get_page(p, PAGE_SIZE)
+         for _ in range(ops)])
+    results["random_get_hyper"] = measure(
+        [lambda p=rng.randint(1, pages): hyper_server.get_hyper(p, PAGE_SIZE)
+         for _ in range(ops)])
+
+    indexed = index_server.indexed_dataset()
+    for position in rng.sample(range(rows), rows // 10):
+        del indexed[position]
+    cursor = {"index": 0}
+
+    def walk() -> None:
+        """Follows next_index, restarting at 0 past the end.
+        """
+        page = index_server.get_hyper_index(cursor["index"], PAGE_SIZE)
+        cursor["index"] = page["next_index"] or 0
+
+    results["deleted_cursor_walk"] = measure([walk] * ops)
+    results["peak_rss_kb"] = resource.getrusage(
+        resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+
+def main() -> None:
+    """Parses arguments, runs the benchmark and prints a report.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="19418,1000000",
+                        help="comma-separated dataset sizes")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="comma-separated backends to compare")
+    parser.add_argument("--ops", type=int, default=2000,
+                        help="operations per access pattern")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+
+    report = {}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in [int(n) for n in args.rows.split(",")]:
+            path = os.path.join(workdir, "names_{}.csv".format(rows))
+            write_dataset(path, rows, args.seed)
+            for backend in args.backends.split(","):
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_backend,
+                                        (path, backend, args.ops, args.seed))
+                report["{}/{}".format(rows, backend)] = result
+                print("rows={} backend={} load={:.3f}s peak_rss={} KB".format(
+                    rows, backend, result["load_s"], result["peak_rss_kb"]))
+                for pattern, stats in result.items():
+                    if isinstance(stats, dict):
+                        print("  {:<22} p50={:>9.1f}us p99={:>9.1f}us "
+                              "{:>10.0f} ops/s".format(
+                                  pattern, stats["p50_us"], stats["p99_us"],
+                                  stats["ops_per_sec"]))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
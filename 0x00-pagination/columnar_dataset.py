@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Columnar in-memory store for the popular baby names dataset.
+"""
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Tuple, Union
+
+
+COLUMNS = ("year", "gender", "ethnicity", "name", "count", "rank")
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_MAGIC = b"BNSNAP2" + sys.byteorder[0].upper().encode()
+SNAPSHOT_HEADER = struct.Struct("<8sQQ")
+SNAPSHOT_ALIGN = 8
+
+
+class Dictionary:
+    """Dictionary-encoded text column: one code per row and a table
+       holding each distinct value once.
+    """
+
+    def __init__(self, typecode: str = "H"):
+        self.values: List[str] = []
+        self.codes = array(typecode)
+        self.__lookup: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        """Appends a value, storing its text only the first time.
+        """
+        code = self.__lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.__lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        """Number of rows in the column.
+        """
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        """Decodes the value stored at index.
+        """
+        return self.values[self.codes[index]]
+
+
+class ColumnarDataset(Sequence):
+    """Read-only dataset that keeps every column in a compact array
+       and only builds row lists for the rows that are requested.
+    """
+
+    def __init__(self):
+        self.year = array("H")
+        self.gender = Dictionary("B")
+        self.ethnicity = Dictionary("B")
+        self.name = Dictionary("H")
+        self.count = array("I")
+        self.rank = array("H")
+        self.header: List[str] = list(COLUMNS)
+
+    @classmethod
+    def load(cls, path: str) -> "ColumnarDataset":
+        """Loads path from its snapshot when the snapshot is newer than
+           the CSV, otherwise parses the CSV and refreshes the snapshot.
+        """
+        snapshot = path + SNAPSHOT_SUFFIX
+        try:
+            if os.path.getmtime(snapshot) >= os.path.getmtime(path):
+                return cls.from_snapshot(snapshot)
+        except (OSError, ValueError):
+            pass
+        dataset = cls.from_csv(path)
+        try:
+            dataset.save_snapshot(snapshot)
+        except OSError:
+            pass
+        return dataset
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ColumnarDataset":
+        """Loads a CSV file, keeping its header line aside.
+        """
+        dataset = cls()
+        with open(path) as f:
+            reader = csv.reader(f)
+            dataset.header = next(reader, dataset.header)
+            for row in reader:
+                dataset.append(row)
+        return dataset
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "ColumnarDataset":
+        """Maps a snapshot written by save_snapshot. Numeric columns and
+           string codes are memoryviews over the mapping, so nothing but
+           the string tables is copied. The result is read-only.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(data)
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError("truncated snapshot")
+        magic, rows, strings_size = SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a snapshot for this platform")
+        dataset = cls()
+        offset = SNAPSHOT_HEADER.size
+        for owner, attr in dataset.__sections():
+            column = getattr(owner, attr)
+            size = rows * column.itemsize
+            if offset + size > len(view):
+                raise ValueError("truncated snapshot")
+            setattr(owner, attr,
+                    view[offset:offset + size].cast(column.typecode))
+            offset += size + -size % SNAPSHOT_ALIGN
+        strings = bytes(view[offset:offset + strings_size])
+        gender, ethnicity, name, dataset.header = json.loads(
+            strings.decode())
+        dataset.gender.values = gender
+        dataset.ethnicity.values = ethnicity
+        dataset.name.values = name
+        return dataset
+
+    def save_snapshot(self, path: str) -> None:
+        """Writes the columns to path in the snapshot format. The file
+           is written beside path and renamed into place.
+        """
+        strings = json.dumps([self.gender.values, self.ethnicity.values,
+                              self.name.values, self.header]).encode()
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(self),
+                                             len(strings)))
+                for owner, attr in self.__sections():
+                    raw = getattr(owner, attr).tobytes()
+                    f.write(raw)
+                    f.write(b"\0" * (-len(raw) % SNAPSHOT_ALIGN))
+                f.write(strings)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __sections(self) -> List[Tuple[object, str]]:
+        """(owner, attribute) of each numeric or code array, in the
+           order they are stored in a snapshot.
+        """
+        return [(self, "year"), (self.gender, "codes"),
+                (self.ethnicity, "codes"), (self.name, "codes"),
+                (self, "count"), (self, "rank")]
+
+    def append(self, row: List[str]) -> None:
+        """Adds one parsed CSV row to the columns.
+        """
+        year, gender, ethnicity, name, count, rank = row
+        self.year.append(int(year))
+        self.gender.append(gender)
+        self.ethnicity.append(ethnicity)
+        self.name.append(name)
+        self.count.append(int(count))
+        self.rank.append(int(rank))
+
+    def column(self, name: str) -> Sequence:
+        """Returns a column by name, typed as stored.
+        """
+        if name not in COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def row(self, index: int) -> List[str]:
+        """Builds the row at index in the CSV's list-of-str form.
+        """
+        return [
+            str(self.year[index]),
+            self.gender[index],
+            self.ethnicity[index],
+            self.name[index],
+            str(self.count[index]),
+            str(self.rank[index]),
+        ]
+
+    def __len__(self) -> int:
+        """Number of rows in the dataset.
+        """
+        return len(self.year)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Returns one row, or a list of rows for a slice.
+        """
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.row(index)
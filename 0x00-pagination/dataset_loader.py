@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Selects the storage backend used to load a pagination dataset.
+"""
+import os
+import threading
+from collections.abc import Sequence
+from typing import Dict, Tuple
+
+from columnar_dataset import ColumnarDataset
+from mapped_dataset import MappedDataset
+
+
+BACKENDS = {
+    "columnar": ColumnarDataset.load,
+    "mmap": MappedDataset.open,
+}
+
+_shared: Dict[Tuple[str, str], Sequence] = {}
+_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def load_dataset(path: str, backend: str = "columnar") -> Sequence:
+    """Loads the dataset at path with the named backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError("unknown dataset backend: {}".format(backend))
+    return BACKENDS[backend](path)
+
+
+def shared_dataset(path: str, backend: str = "columnar") -> Sequence:
+    """Returns the process-wide copy of the dataset at path, loading it
+       on first use. Threads that ask while it is loading wait for that
+       one load instead of starting their own.
+    """
+    key = (os.path.abspath(path), backend)
+    dataset = _shared.get(key)
+    if dataset is not None:
+        return dataset
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _shared:
+            _shared[key] = load_dataset(path, backend)
+        return _shared[key]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Position-indexed view of a dataset that survives deletions.
+"""
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, Iterator, List, Optional
+
+
+class IndexedDataset(MutableMapping):
+    """Maps each row's original position to the row. Deleted positions
+       are tombstoned in a byte array rather than shifted, so finding
+       the next live position is a single C-level scan and removing a
+       row never renumbers the others.
+    """
+
+    def __init__(self, dataset: Sequence):
+        self.__dataset = dataset
+        self.__live = bytearray(b"\x01") * len(dataset)
+        self.__size = len(dataset)
+        self.__max_key = len(dataset) - 1 if len(dataset) else None
+        self.__overrides: Dict[int, List] = {}
+
+    def max_key(self) -> Optional[int]:
+        """Highest live position, or None when every row is deleted.
+        """
+        return self.__max_key
+
+    def next_key(self, index: int) -> Optional[int]:
+        """First live position at or after index.
+        """
+        key = self.__live.find(1, max(index, 0))
+        return key if key >= 0 else None
+
+    def keys_from(self, index: int, count: int) -> List[int]:
+        """Up to count live positions, starting at index.
+        """
+        keys = []
+        key = self.next_key(index)
+        while key is not None and len(keys) < count:
+            keys.append(key)
+            key = self.next_key(key + 1)
+        return keys
+
+    def __contains__(self, key) -> bool:
+        """Whether key is a live position.
+        """
+        return (type(key) == int and 0 <= key < len(self.__live)
+                and self.__live[key] == 1)
+
+    def __getitem__(self, key: int) -> List:
+        """Returns the row stored at position key.
+        """
+        if key not in self:
+            raise KeyError(key)
+        if key in self.__overrides:
+            return self.__overrides[key]
+        return self.__dataset[key]
+
+    def __setitem__(self, key: int, row: List) -> None:
+        """Replaces or restores the row at an existing position.
+        """
+        if type(key) != int or not 0 <= key < len(self.__live):
+            raise KeyError(key)
+        if not self.__live[key]:
+            self.__live[key] = 1
+            self.__size += 1
+            if self.__max_key is None or key > self.__max_key:
+                self.__max_key = key
+        self.__overrides[key] = row
+
+    def __delitem__(self, key: int) -> None:
+        """Tombstones the row at position key.
+        """
+        if key not in self:
+            raise KeyError(key)
+        self.__live[key] = 0
+        self.__size -= 1
+        self.__overrides.pop(key, None)
+        if key == self.__max_key:
+            last = self.__live.rfind(1, 0, key)
+            self.__max_key = last if last >= 0 else None
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields live positions in ascending order.
+        """
+        key = self.next_key(0)
+        while key is not None:
+            yield key
+            key = self.next_key(key + 1)
+
+    def __len__(self) -> int:
+        """Number of live rows.
+        """
+        return self.__size
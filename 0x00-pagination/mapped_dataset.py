@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Memory-mapped, lazily parsed view of the popular baby names CSV.
+"""
+import csv
+import mmap
+import os
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Union
+
+from columnar_dataset import COLUMNS
+
+
+INDEX_SUFFIX = ".idx"
+NUMERIC_COLUMNS = ("year", "count", "rank")
+
+
+def build_offsets(data: Union[bytes, mmap.mmap]) -> array:
+    """Returns the byte offset of every data row, followed by the
+       offset one past the last row. The header line is skipped.
+       Fields must not contain embedded newlines.
+    """
+    offsets = array("Q")
+    size = len(data)
+    pos = data.find(b"\n") + 1 or size
+    while pos < size:
+        offsets.append(pos)
+        end = data.find(b"\n", pos)
+        if end < 0:
+            break
+        pos = end + 1
+    offsets.append(size)
+    return offsets
+
+
+def load_offsets(path: str, data: mmap.mmap) -> array:
+    """Loads row offsets from the sidecar index next to path, or builds
+       them and tries to write the sidecar for the next process.
+    """
+    index_path = path + INDEX_SUFFIX
+    try:
+        if os.path.getmtime(index_path) >= os.path.getmtime(path):
+            offsets = array("Q")
+            with open(index_path, "rb") as f:
+                offsets.frombytes(f.read())
+            if offsets and offsets[-1] == len(data):
+                return offsets
+    except (OSError, ValueError):
+        pass
+    offsets = build_offsets(data)
+    try:
+        with open(index_path, "wb") as f:
+            offsets.tofile(f)
+    except OSError:
+        pass
+    return offsets
+
+
+class MappedDataset(Sequence):
+    """Read-only dataset backed by an mmap of the CSV file. Only the
+       row offsets are held in memory; rows are parsed on access.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self.__data = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.__data = b""
+        self.offsets = load_offsets(path, self.__data)
+        self.__columns: Dict[str, list] = {}
+        first_line = self.__data[:self.offsets[0]].decode()
+        self.header: List[str] = next(csv.reader([first_line])) or \
+            list(COLUMNS)
+
+    @classmethod
+    def open(cls, path: str) -> "MappedDataset":
+        """Maps the CSV file at path.
+        """
+        return cls(path)
+
+    def rows(self, start: int, stop: int) -> List[List[str]]:
+        """Parses the rows in [start, stop) from the mapped file.
+        """
+        start = max(start, 0)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        chunk = self.__data[self.offsets[start]:self.offsets[stop]]
+        lines = chunk.decode().split("\n")[:stop - start]
+        return list(csv.reader(lines))
+
+    def row(self, index: int) -> List[str]:
+        """Parses the row at index.
+        """
+        return self.rows(index, index + 1)[0]
+
+    def column(self, name: str) -> Sequence:
+        """Returns a column by name, parsing the whole file the first
+           time a column is asked for.
+        """
+        if name not in COLUMNS:
+            raise KeyError(name)
+        if name not in self.__columns:
+            position = COLUMNS.index(name)
+            values = [row[position] for row in self.rows(0, len(self))]
+            if name in NUMERIC_COLUMNS:
+                values = [int(value) for value in values]
+            self.__columns[name] = values
+        return self.__columns[name]
+
+    def __len__(self) -> int:
+        """Number of rows in the dataset.
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Returns one row, or a list of rows for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self.rows(start, stop)
+            return [self.row(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.row(index)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Posting-list indexes on the categorical columns of a dataset.
+"""
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Tuple, Union
+
+
+def filter_key(filters: Dict = None) -> Tuple[Tuple[str, str], ...]:
+    """Hashable, order-independent form of a filters mapping.
+    """
+    return tuple(sorted((name, str(v)) for name, v in (filters or {}).items()))
+
+
+class Selection(Sequence):
+    """Rows of a dataset at the given positions, in position order.
+       Row lists are only built for the positions that are read.
+    """
+
+    def __init__(self, dataset: Sequence, positions: array):
+        self.dataset = dataset
+        self.positions = positions
+
+    def __len__(self) -> int:
+        """Number of selected rows.
+        """
+        return len(self.positions)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Returns one selected row, or a list of them for a slice.
+        """
+        if isinstance(index, slice):
+            return [self.dataset[i] for i in self.positions[index]]
+        return self.dataset[self.positions[index]]
+
+
+class SecondaryIndex:
+    """Maps every value of each indexed column to the ascending array
+       of row positions holding it. Intersections for recent filter
+       combinations are kept in a small LRU so paging through one
+       filtered result does not repeat the intersection.
+    """
+    MAX_SELECTIONS = 64
+
+    def __init__(self, dataset: Sequence,
+                 columns: Tuple[str, ...] = ("year", "gender", "ethnicity")):
+        self.dataset = dataset
+        self.columns = tuple(columns)
+        self.postings: Dict[str, Dict[str, array]] = {}
+        for name in self.columns:
+            postings: Dict[str, array] = {}
+            for position, value in enumerate(dataset.column(name)):
+                value = str(value)
+                if value not in postings:
+                    postings[value] = array("I")
+                postings[value].append(position)
+            self.postings[name] = postings
+        self.__selections: OrderedDict = OrderedDict()
+
+    def select(self, filters: Dict) -> Selection:
+        """Rows matching every column=value pair in filters.
+        """
+        for name in filters:
+            assert name in self.postings, "column is not indexed: " + name
+        key = filter_key(filters)
+        positions = self.__selections.get(key)
+        if positions is None:
+            positions = self.__intersect(key)
+            self.__selections[key] = positions
+            if len(self.__selections) > self.MAX_SELECTIONS:
+                self.__selections.popitem(last=False)
+        else:
+            self.__selections.move_to_end(key)
+        return Selection(self.dataset, positions)
+
+    def __intersect(self, key: Tuple[Tuple[str, str], ...]) -> array:
+        """Intersects the posting lists named in key.
+        """
+        if not key:
+            return array("I", range(len(self.dataset)))
+        lists = sorted((self.postings[name].get(value, array("I"))
+                        for name, value in key), key=len)
+        if len(lists) == 1:
+            return lists[0]
+        matches = set(lists[0]).intersection(*lists[1:])
+        return array("I", sorted(matches))
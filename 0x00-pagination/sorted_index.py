@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Sorted permutation indexes and opaque keyset cursors.
+"""
+import base64
+import json
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Hashable, Iterator, Tuple
+
+from columnar_dataset import COLUMNS
+from mapped_dataset import NUMERIC_COLUMNS
+from secondary_index import Selection
+
+
+class SortedIndex:
+    """Row positions of a dataset ordered by one or more columns. The
+       row position is always the last sort component, so every key is
+       unique and a cursor identifies exactly one place in the order.
+    """
+
+    def __init__(self, dataset: Sequence, columns: Tuple[str, ...]):
+        self.columns = tuple(columns)
+        self.__values = [dataset.column(name) for name in self.columns]
+        self.order = array("I", sorted(range(len(dataset)), key=self.key))
+
+    def key(self, position: int) -> tuple:
+        """Sort key of the row at position.
+        """
+        return tuple(v[position] for v in self.__values) + (position,)
+
+    def seek(self, key: tuple) -> int:
+        """Offset in the order of the first row sorting after key,
+           found by binary search over the sort keys of the order.
+        """
+        key = tuple(key)
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if key < self.key(self.order[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def iter_after(self, key: tuple = None) -> Iterator[int]:
+        """Yields row positions in order, starting after key.
+        """
+        start = 0 if key is None else self.seek(key)
+        for offset in range(start, len(self.order)):
+            yield self.order[offset]
+
+
+def parse_sort(sort_by: str) -> Tuple[str, bool]:
+    """Splits "count" / "-count" into the column and whether the order
+       is descending.
+    """
+    descending = sort_by.startswith("-")
+    column = sort_by.lstrip("-")
+    assert column in COLUMNS, "unknown sort column: " + column
+    return column, descending
+
+
+class SortedViews:
+    """Caches the row order of recently requested sortings. Each view
+       is one array of positions, and at most MAX_VIEWS of them are
+       kept, least recently used first out.
+    """
+    MAX_VIEWS = 8
+
+    def __init__(self, max_views: int = MAX_VIEWS):
+        self.max_views = max_views
+        self.__views: OrderedDict = OrderedDict()
+
+    def view(self, rows: Sequence, sort_by: str,
+             key: Hashable = ()) -> Selection:
+        """Returns rows ordered by sort_by. key identifies which rows
+           were passed in, e.g. the filters that selected them. Ties
+           keep file order in both directions.
+        """
+        column, descending = parse_sort(sort_by)
+        if isinstance(rows, Selection):
+            dataset, positions = rows.dataset, rows.positions
+        else:
+            dataset, positions = rows, range(len(rows))
+        cache_key = (column, descending, key)
+        order = self.__views.get(cache_key)
+        if order is None:
+            values = dataset.column(column)
+            order = array("I", sorted(positions, key=values.__getitem__,
+                                      reverse=descending))
+            self.__views[cache_key] = order
+            if len(self.__views) > self.max_views:
+                self.__views.popitem(last=False)
+        else:
+            self.__views.move_to_end(cache_key)
+        return Selection(dataset, order)
+
+
+def encode_cursor(columns: Tuple[str, ...], key: tuple) -> str:
+    """Packs a sort key into an opaque, URL-safe token.
+    """
+    payload = json.dumps([list(columns), list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(columns: Tuple[str, ...], cursor: str) -> tuple:
+    """Unpacks a token made by encode_cursor for the same columns,
+       checking that each component has its column's type and that the
+       last one is an int row position.
+    """
+    try:
+        names, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("invalid cursor")
+    if not isinstance(names, list) or not isinstance(key, list) or \
+            tuple(names) != tuple(columns) or len(key) != len(columns) + 1:
+        raise ValueError("cursor does not match this ordering")
+    kinds = [int if name in NUMERIC_COLUMNS else str for name in columns]
+    if any(type(value) is not kind
+           for value, kind in zip(key, kinds + [int])):
+        raise ValueError("invalid cursor")
+    return tuple(key)
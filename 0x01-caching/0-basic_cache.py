@@ -10,13 +10,40 @@ class BasicCache(BaseCaching):
     """A class for storing and retrieving items using a simple dictionary.
     """
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Stores an item in the cache using the specified key.
         """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
         if key and item:
-            self.cache_data[key] = item
+            self.store(key, item, ttl=ttl)
 
     def get(self, key):
         """Fetches an item from the cache by its key.
         """
-        return self.cache_data.get(key, None)
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key.
+        """
+        return self.lookup(keys)
+
+    def put_many(self, mapping, ttl=None):
+        """Stores every item of mapping, sweeping expired keys once
+           for the whole batch.
+        """
+        if self.wheel is not None:
+            self.sweep(self.SWEEP_BUDGET * len(mapping))
+        for key, item in mapping.items():
+            if self.wheel is not None:
+                self.expire(key)
+            if key and item:
+                self.store(key, item, ttl=ttl)
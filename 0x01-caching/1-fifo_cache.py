@@ -13,24 +13,62 @@ class FIFOCache(BaseCaching):
       they were added when the cache limit is reached.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Sets up the cache using an ordered dictionary.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Stores an item in the cache. Removes the oldest
            item if the cache is full.
         """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
         if key and item:
-            self.cache_data[key] = item
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
+            size = self.entry_size(key, item)
+            if self.too_large(size):
+                self.delete(key)
+                return
+            self.store(key, item, size, ttl)
+        while self.over_capacity():
             # Remove the first-added item
-            first_key, _ = self.cache_data.popitem(False)
-            print("DISCARD:", first_key)
+            first_key, first_item = self.cache_data.popitem(False)
+            self.discard(first_key, first_item)
 
     def get(self, key):
         """Returns the item associated with the specified key.
         """
-        return self.cache_data.get(key, None)
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key.
+        """
+        return self.lookup(keys)
+
+    def put_many(self, mapping, ttl=None):
+        """Stores every item of mapping, as put would one at a
+           time, sweeping expired keys once for the whole batch.
+        """
+        if self.wheel is not None:
+            self.sweep(self.SWEEP_BUDGET * len(mapping))
+        for key, item in mapping.items():
+            if self.wheel is not None:
+                self.expire(key)
+            if key and item:
+                size = self.entry_size(key, item)
+                if self.too_large(size):
+                    self.delete(key)
+                    continue
+                self.store(key, item, size, ttl)
+            while self.over_capacity():
+                first_key, first_item = self.cache_data.popitem(False)
+                self.discard(first_key, first_item)
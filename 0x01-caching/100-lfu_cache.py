@@ -10,73 +10,125 @@ from base_caching import BaseCaching
 class LFUCache(BaseCaching):
     """A cache that implements a Least Frequently Used (LFU)
        eviction strategy. When the cache exceeds its limit,
-       it removes the item with the lowest access frequency.
+       it removes the item with the lowest access frequency,
+       the least recently used one among equal frequencies.
     """
 
-    def __init__(self):
-        """Sets up the cache with an ordered dictionary to
-           store items and a frequency list.
+    def __init__(self, *args, **kwargs):
+        """Sets up the cache with a frequency per key and, for
+           each frequency, its keys from least to most recent.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
-        self.keys_freq = []
+        self.keys_freq = {}
+        self.freq_keys = {}
+        self.min_freq = 0
 
-    def __reorder_items(self, mru_key):
-        """Reorganizes items in the cache based on frequency,
-           promoting the most recently used item.
+    def __touch(self, key):
+        """Moves a key up one frequency, to the most recent end
+           of its new frequency bucket.
         """
-        max_positions = []
-        mru_freq = 0
-        mru_pos = 0
-        ins_pos = 0
+        freq = self.keys_freq[key]
+        bucket = self.freq_keys[freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_keys[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.keys_freq[key] = freq + 1
+        if freq + 1 not in self.freq_keys:
+            self.freq_keys[freq + 1] = OrderedDict()
+        self.freq_keys[freq + 1][key] = None
 
-        for i, key_freq in enumerate(self.keys_freq):
-            if key_freq[0] == mru_key:
-                mru_freq = key_freq[1] + 1
-                mru_pos = i
-                break
-            elif len(max_positions) == 0:
-                max_positions.append(i)
-            elif key_freq[1] < self.keys_freq[max_positions[-1]][1]:
-                max_positions.append(i)
-
-        max_positions.reverse()
-        for pos in max_positions:
-            if self.keys_freq[pos][1] >= mru_freq:
-                break
-            ins_pos = pos
+    def __evict(self):
+        """Removes the least recently used key among those
+           with the lowest frequency.
+        """
+        lfu_key = next(iter(self.freq_keys[self.min_freq]))
+        lfu_item = self.cache_data[lfu_key]
+        deadline = self.expires.get(lfu_key)
+        self.delete(lfu_key)
+        self.discard(lfu_key, lfu_item, deadline)
 
-        self.keys_freq.pop(mru_pos)
-        self.keys_freq.insert(ins_pos, [mru_key, mru_freq])
+    def delete(self, key):
+        """Removes key and its frequency, if present.
+        """
+        if key not in self.cache_data:
+            return
+        freq = self.keys_freq.pop(key)
+        bucket = self.freq_keys[freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_keys[freq]
+            if self.min_freq == freq and self.freq_keys:
+                self.min_freq = min(self.freq_keys)
+        super().delete(key)
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Adds an item to the cache. If the cache is full,
            evicts the least frequently used item.
         """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
         if key is None or item is None:
             return
 
-        if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                lfu_key, _ = self.keys_freq[-1]
-                self.cache_data.pop(lfu_key)
-                self.keys_freq.pop()
-                print("DISCARD:", lfu_key)
+        size = self.entry_size(key, item)
+        if self.too_large(size):
+            self.delete(key)
+            return
+        while self.needs_room(key, size):
+            self.__evict()
 
-            self.cache_data[key] = item
-            ins_index = len(self.keys_freq)
-            for i, key_freq in enumerate(self.keys_freq):
-                if key_freq[1] == 0:
-                    ins_index = i
-                    break
-            self.keys_freq.insert(ins_index, [key, 0])
+        if key not in self.cache_data:
+            self.store(key, item, size, ttl)
+            self.keys_freq[key] = 0
+            if 0 not in self.freq_keys:
+                self.freq_keys[0] = OrderedDict()
+            self.freq_keys[0][key] = None
+            self.min_freq = 0
         else:
-            self.cache_data[key] = item
-            self.__reorder_items(key)
+            self.store(key, item, size, ttl)
+            self.__touch(key)
 
     def get(self, key):
         """Fetches an item by key, updating its access frequency.
         """
-        if key is not None and key in self.cache_data:
-            self.__reorder_items(key)
-        return (self.cache_data.get(key, None))
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__touch(key)
+        return item
+
+    def entries(self):
+        """(key, item, frequency) by increasing frequency, and from
+           least to most recent within one.
+        """
+        return [(key, self.cache_data[key], freq)
+                for freq in sorted(self.freq_keys)
+                for key in self.freq_keys[freq]]
+
+    def restore(self, key, freq):
+        """Moves a key just put back to its dumped frequency.
+        """
+        old_freq = self.keys_freq[key]
+        bucket = self.freq_keys[old_freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_keys[old_freq]
+        self.keys_freq[key] = freq
+        if freq not in self.freq_keys:
+            self.freq_keys[freq] = OrderedDict()
+        self.freq_keys[freq][key] = None
+        self.min_freq = min(self.freq_keys)
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key,
+           updating the frequency of each hit.
+        """
+        return self.lookup(keys, self.__touch)
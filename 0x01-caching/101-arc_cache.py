@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Module for an Adaptive Replacement Cache (ARC) caching system.
+"""
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """A cache implementing Adaptive Replacement (ARC). Keys seen
+       once live in t1 and keys seen again in t2, each ordered from
+       least to most recent. Evicted keys are remembered, without
+       their items, in the ghost lists b1 and b2. A hit in a ghost
+       list moves the target size p of t1 towards the list that
+       would have kept the key, so a one-off scan only churns t1
+       while the frequently used keys in t2 survive.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Sets up the four lists and the adaptive target p.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("ARCCache limits by item count only")
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+
+    def __replace(self, key):
+        """Evicts the least recent key of t1 or t2 into its
+           ghost list, choosing t1 while it is above target.
+        """
+        if self.t1 and (not self.t2 or len(self.t1) > self.p or
+                        (key in self.b2 and len(self.t1) == self.p)):
+            old_key, _ = self.t1.popitem(last=False)
+            self.b1[old_key] = None
+        else:
+            old_key, _ = self.t2.popitem(last=False)
+            self.b2[old_key] = None
+        self.discard(old_key, self.cache_data.pop(old_key))
+
+    def __make_room(self, key):
+        """Evicts one key if the cache is full.
+        """
+        if len(self.cache_data) >= self.max_items:
+            self.__replace(key)
+
+    def delete(self, key):
+        """Removes key from the cache, if present.
+        """
+        self.t1.pop(key, None)
+        self.t2.pop(key, None)
+        super().delete(key)
+
+    def put(self, key, item, ttl=None):
+        """Stores an item. Ghost hits adapt the target size of t1
+           before the key is placed in t2.
+        """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
+        if key is None or item is None or self.too_large():
+            return
+        c = self.max_items
+        if key in self.t1 or key in self.t2:
+            self.t1.pop(key, None)
+            self.t2[key] = None
+            self.t2.move_to_end(key)
+        elif key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            self.__make_room(key)
+            del self.b1[key]
+            self.t2[key] = None
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self.__make_room(key)
+            del self.b2[key]
+            self.t2[key] = None
+        else:
+            if len(self.t1) + len(self.b1) >= c:
+                if len(self.t1) < c:
+                    self.b1.popitem(last=False)
+                    self.__make_room(key)
+                else:
+                    old_key, _ = self.t1.popitem(last=False)
+                    self.discard(old_key, self.cache_data.pop(old_key))
+            else:
+                total = (len(self.t1) + len(self.t2) +
+                         len(self.b1) + len(self.b2))
+                if total >= 2 * c and self.b2:
+                    self.b2.popitem(last=False)
+                self.__make_room(key)
+            self.t1[key] = None
+        self.store(key, item, 0, ttl)
+
+    def get(self, key):
+        """Returns the item for key, moving it to the most
+           recent end of t2.
+        """
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__touch(key)
+        return item
+
+    def __touch(self, key):
+        """Moves a resident key to the most recent end of t2.
+        """
+        self.t1.pop(key, None)
+        self.t2[key] = None
+        self.t2.move_to_end(key)
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key,
+           moving each hit to the most recent end of t2.
+        """
+        return self.lookup(keys, self.__touch)
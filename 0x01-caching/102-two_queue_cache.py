@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Module for a Two Queue (2Q) caching system.
+"""
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class TwoQueueCache(BaseCaching):
+    """A cache implementing the full 2Q policy. New keys enter a_in,
+       a FIFO holding about a quarter of the cache. Keys pushed out of
+       a_in are remembered, without their items, in the a_out ghost
+       FIFO. Only a key seen again while in a_out is promoted to a_m,
+       an LRU holding the rest of the cache, so keys read once during
+       a scan never displace the hot set in a_m.
+    """
+    IN_RATIO = 0.25
+    OUT_RATIO = 0.5
+
+    def __init__(self, *args, **kwargs):
+        """Sets up the three queues and their sizes.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("TwoQueueCache limits by item count only")
+        self.a_in = OrderedDict()
+        self.a_out = OrderedDict()
+        self.a_m = OrderedDict()
+        self.in_size = max(1, int(self.max_items * self.IN_RATIO))
+        self.out_size = max(1, int(self.max_items * self.OUT_RATIO))
+
+    def __reclaim(self):
+        """Evicts one key if the cache is full: the oldest of a_in
+           while a_in is over its share, else the LRU key of a_m.
+        """
+        if len(self.cache_data) < self.max_items:
+            return
+        if len(self.a_in) > self.in_size or not self.a_m:
+            old_key, _ = self.a_in.popitem(last=False)
+            self.a_out[old_key] = None
+            if len(self.a_out) > self.out_size:
+                self.a_out.popitem(last=False)
+        else:
+            old_key, _ = self.a_m.popitem(last=False)
+        self.discard(old_key, self.cache_data.pop(old_key))
+
+    def delete(self, key):
+        """Removes key from the cache, if present.
+        """
+        self.a_in.pop(key, None)
+        self.a_m.pop(key, None)
+        super().delete(key)
+
+    def put(self, key, item, ttl=None):
+        """Stores an item, in a_m if its key was recently pushed
+           out of a_in and in a_in otherwise.
+        """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
+        if key is None or item is None or self.too_large():
+            return
+        if key in self.a_m:
+            self.a_m.move_to_end(key)
+        elif key not in self.a_in:
+            self.__reclaim()
+            if key in self.a_out:
+                del self.a_out[key]
+                self.a_m[key] = None
+            else:
+                self.a_in[key] = None
+        self.store(key, item, 0, ttl)
+
+    def get(self, key):
+        """Returns the item for key. Hits in a_m refresh its
+           recency; hits in a_in leave the FIFO order alone.
+        """
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__touch(key)
+        return item
+
+    def __touch(self, key):
+        """Refreshes the recency of a key in a_m.
+        """
+        if key in self.a_m:
+            self.a_m.move_to_end(key)
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key.
+        """
+        return self.lookup(keys, self.__touch)
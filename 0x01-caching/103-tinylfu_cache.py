@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Module for a Window TinyLFU (W-TinyLFU) caching system.
+"""
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+HALVE = bytes(i >> 1 for i in range(256))
+MASK_64 = (1 << 64) - 1
+SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+         0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+
+class CountMinSketch:
+    """Approximate access counts in four rows of small counters.
+       A key's estimate is its smallest counter. Counters stop at
+       15, and all of them are halved once sample_size increments
+       have been recorded, so old popularity fades.
+    """
+    MAX_COUNT = 15
+
+    def __init__(self, capacity):
+        """Sizes each row to the next power of two above capacity.
+        """
+        bits = 1
+        while (1 << bits) < max(capacity, 1) * 2:
+            bits += 1
+        self.shift = 64 - bits
+        self.rows = [bytearray(1 << bits) for _ in SEEDS]
+        self.sample_size = 10 * max(capacity, 1)
+        self.additions = 0
+
+    def __indexes(self, key):
+        """One counter position per row for key, by multiplying
+           its hash with a different odd constant per row.
+        """
+        h = hash(key)
+        return [((h * seed) & MASK_64) >> self.shift for seed in SEEDS]
+
+    def increment(self, key):
+        """Records one access to key.
+        """
+        for row, i in zip(self.rows, self.__indexes(key)):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.rows = [row.translate(HALVE) for row in self.rows]
+            self.additions //= 2
+
+    def estimate(self, key):
+        """Estimated number of recent accesses to key.
+        """
+        return min(row[i] for row, i in zip(self.rows, self.__indexes(key)))
+
+
+class TinyLFUCache(BaseCaching):
+    """A cache implementing W-TinyLFU. New keys enter a small LRU
+       window (about 1% of the cache). A key leaving the window is
+       only admitted to the main segmented LRU if the frequency
+       sketch rates it above the main cache's next victim, so a scan
+       of one-off keys cannot push out frequently used ones. The
+       main cache is split into probation (new arrivals) and
+       protected (keys hit again while on probation).
+    """
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, *args, **kwargs):
+        """Sets up the window, the main segments and the sketch.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("TinyLFUCache limits by item count only")
+        self.window_size = max(1, int(self.max_items * self.WINDOW_RATIO))
+        self.main_size = max(0, self.max_items - self.window_size)
+        self.protected_size = int(self.main_size * self.PROTECTED_RATIO)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(self.max_items)
+
+    def __evict(self, key):
+        """Removes a resident key as an eviction.
+        """
+        self.discard(key, self.cache_data.pop(key))
+
+    def __promote(self, key):
+        """Moves a probation key to protected, demoting the LRU
+           protected key to probation if protected is full.
+        """
+        del self.probation[key]
+        self.protected[key] = None
+        if len(self.protected) > self.protected_size:
+            old_key, _ = self.protected.popitem(last=False)
+            self.probation[old_key] = None
+
+    def __admit(self):
+        """Moves the LRU window key into the main cache, or evicts
+           it if the main cache is full and its victim is used
+           more often.
+        """
+        candidate, _ = self.window.popitem(last=False)
+        if len(self.probation) + len(self.protected) < self.main_size:
+            self.probation[candidate] = None
+            return
+        victims = self.probation or self.protected
+        if not victims:
+            self.__evict(candidate)
+            return
+        victim = next(iter(victims))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del victims[victim]
+            self.__evict(victim)
+            self.probation[candidate] = None
+        else:
+            self.__evict(candidate)
+
+    def delete(self, key):
+        """Removes key from the cache, if present.
+        """
+        self.window.pop(key, None)
+        self.probation.pop(key, None)
+        self.protected.pop(key, None)
+        super().delete(key)
+
+    def __touch(self, key):
+        """Refreshes the recency of a resident key.
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.probation:
+            self.__promote(key)
+        else:
+            self.protected.move_to_end(key)
+
+    def put(self, key, item, ttl=None):
+        """Stores an item. New keys go to the window, whose
+           overflow competes for a place in the main cache.
+        """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
+        if key is None or item is None or self.too_large():
+            return
+        self.sketch.increment(key)
+        if key in self.cache_data:
+            self.__touch(key)
+            self.store(key, item, 0, ttl)
+            return
+        self.window[key] = None
+        self.store(key, item, 0, ttl)
+        if len(self.window) > self.window_size:
+            self.__admit()
+
+    def get(self, key):
+        """Returns the item for key, counting the access in the
+           sketch whether or not it hits.
+        """
+        if self.expires:
+            self.expire(key)
+        if key is None:
+            return None
+        self.sketch.increment(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__touch(key)
+        return item
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key,
+           counting every key in the sketch.
+        """
+        keys = list(keys)
+        for key in keys:
+            if key is not None:
+                self.sketch.increment(key)
+        return self.lookup(keys, self.__touch)
@@ -13,24 +13,30 @@ class LIFOCache(BaseCaching):
        recently added item is removed first.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initializes the cache using an ordered dictionary.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Inserts an item into the cache. Evicts the newest
            item if the cache exceeds its limit.
         """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
         if key is None or item is None:
             return
-        if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                # Remove the most recent item
-                last_key, _ = self.cache_data.popitem(True)
-                print("DISCARD:", last_key)
-        self.cache_data[key] = item
+        size = self.entry_size(key, item)
+        if self.too_large(size):
+            self.delete(key)
+            return
+        while self.needs_room(key, size):
+            # Remove the most recent item
+            last_key, last_item = self.cache_data.popitem(True)
+            self.discard(last_key, last_item)
+        self.store(key, item, size, ttl)
         # Ensure the new item is last in order
         self.cache_data.move_to_end(key, last=True)
 
@@ -38,4 +44,16 @@ class LIFOCache(BaseCaching):
         """Returns the item associated with the
            specified key, if available.
         """
-        return (self.cache_data.get(key, None))
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key.
+        """
+        return self.lookup(keys)
@@ -13,33 +13,88 @@ class LRUCache(BaseCaching):
     item being removed first when the cache limit is exceeded.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Sets up the cache using an ordered dictionary.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Stores an item in the cache. If the cache is full, removes the
            least recently used item.
         """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
         if key is None or item is None:
             return
-        if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                # Discard the least recently used item
-                lru_key, _ = self.cache_data.popitem(True)
-                print("DISCARD:", lru_key)
-            self.cache_data[key] = item
+        size = self.entry_size(key, item)
+        if self.too_large(size):
+            self.delete(key)
+            return
+        while self.needs_room(key, size):
+            # Discard the least recently used item
+            lru_key, lru_item = self.cache_data.popitem(True)
+            self.discard(lru_key, lru_item)
+        is_new = key not in self.cache_data
+        self.store(key, item, size, ttl)
+        if is_new:
             # Place the new item at the start
             self.cache_data.move_to_end(key, last=False)
-        else:
-            self.cache_data[key] = item
 
     def get(self, key):
         """Returns the item associated with the specified key
            and marks it as recently used.
         """
-        if key is not None and key in self.cache_data:
-            self.cache_data.move_to_end(key, last=False)
-        return self.cache_data.get(key, None)
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.cache_data.move_to_end(key, last=False)
+        return item
+
+    def entries(self):
+        """(key, item, None) from the least to the most recently
+           used, the order in which puts rebuild the cache.
+        """
+        entries = [(key, item, None)
+                   for key, item in self.cache_data.items()]
+        entries.reverse()
+        return entries
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key,
+           marking each hit as recently used in the order given.
+        """
+        return self.lookup(keys, self.__refresh)
+
+    def __refresh(self, key):
+        """Moves a resident key to the front.
+        """
+        self.cache_data.move_to_end(key, False)
+
+    def put_many(self, mapping, ttl=None):
+        """Stores every item of mapping, as put would one at a
+           time, sweeping expired keys once for the whole batch.
+        """
+        if self.wheel is not None:
+            self.sweep(self.SWEEP_BUDGET * len(mapping))
+        for key, item in mapping.items():
+            if self.wheel is not None:
+                self.expire(key)
+            if key is None or item is None:
+                continue
+            size = self.entry_size(key, item)
+            if self.too_large(size):
+                self.delete(key)
+                continue
+            while self.needs_room(key, size):
+                lru_key, lru_item = self.cache_data.popitem(True)
+                self.discard(lru_key, lru_item)
+            is_new = key not in self.cache_data
+            self.store(key, item, size, ttl)
+            if is_new:
+                self.cache_data.move_to_end(key, last=False)
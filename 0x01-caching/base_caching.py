@@ -1,18 +1,128 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import os
+import pickle
+import sys
+import time
+from timing_wheel import TimingWheel
+
+
+DUMP_MAGIC = b"CACHEDMP"
+DUMP_BATCH = 1024
+
+
+def shallow_size(key, item):
+    """ Size estimator: bytes of the key and item objects themselves
+    """
+    return sys.getsizeof(key) + sys.getsizeof(item)
+
+
+def deep_size(key, item):
+    """ Size estimator: bytes of the key and item, following the
+        contents of lists, tuples, sets and dicts
+    """
+    seen = set()
+    pending = [key, item]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+    return total
+
+
+def write_dump(path, policy, records):
+    """ Writes records, (key, item, meta, ttl) tuples, to path: the
+        magic bytes, a pickled header, then pickled lists of up to
+        DUMP_BATCH records ending with an empty list. The file is
+        written beside path and renamed over it once complete
+    """
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(DUMP_MAGIC)
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.dump({"policy": policy, "count": len(records)})
+            for start in range(0, len(records), DUMP_BATCH):
+                pickler.dump(records[start:start + DUMP_BATCH])
+                pickler.clear_memo()
+            pickler.dump([])
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_dump(path):
+    """ Yields the records of a file written by write_dump, one
+        batch in memory at a time
+    """
+    with open(path, "rb") as f:
+        if f.read(len(DUMP_MAGIC)) != DUMP_MAGIC:
+            raise ValueError("{} is not a cache dump".format(path))
+        unpickler = pickle.Unpickler(f)
+        unpickler.load()
+        while True:
+            batch = unpickler.load()
+            if not batch:
+                return
+            yield from batch
+
+
+def print_discard(key, item, reason, deadline):
+    """ Listener printing evicted keys the way the caches once did
+    """
+    if reason == "evicted":
+        print("DISCARD:", key)
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the limits a cache is held to: an item count and,
+        optionally, a budget in bytes measured by sizeof
+      - optional expiry: a default ttl in seconds, or one per put;
+        expired keys are dropped when read and swept a few at a
+        time through a timing wheel
+      - counters read through stats(), and listeners told of every
+        eviction, in batches, only when some are subscribed
     """
     MAX_ITEMS = 4
+    SWEEP_BUDGET = 8
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizeof=shallow_size,
+                 ttl=None, clock=time.monotonic):
         """ Initiliaze
         """
         self.cache_data = {}
+        self.max_items = self.MAX_ITEMS if max_items is None else max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.sizes = {}
+        self.current_bytes = 0
+        self.ttl = ttl
+        self.clock = clock
+        self.expires = {}
+        self.wheel = None
+        self.listeners = []
+        self.pending = []
+        self.evict_batch = 1
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.get_time = 0.0
+        self.timed_gets = 0
 
     def print_cache(self):
         """ Print the cache
@@ -21,7 +131,181 @@ class BaseCaching():
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
+    def entry_size(self, key, item):
+        """ Estimated bytes of an entry, or 0 without a byte budget
+        """
+        if self.max_bytes is None:
+            return 0
+        return self.sizeof(key, item)
+
+    def too_large(self, size=0):
+        """ Whether an entry of size bytes can never fit the limits
+        """
+        if self.max_items < 1:
+            return True
+        return self.max_bytes is not None and size > self.max_bytes
+
+    def needs_room(self, key, size=0):
+        """ Whether an entry of size bytes can only be stored under
+            key after evicting something
+        """
+        count = len(self.cache_data) + (key not in self.cache_data)
+        if count > self.max_items:
+            return True
+        if self.max_bytes is None:
+            return False
+        size -= self.sizes.get(key, 0)
+        return self.current_bytes + size > self.max_bytes
+
+    def over_capacity(self):
+        """ Whether the cache currently holds more than its limits
+        """
+        if len(self.cache_data) > self.max_items:
+            return True
+        return self.max_bytes is not None and \
+            self.current_bytes > self.max_bytes
+
+    def store(self, key, item, size=0, ttl=None):
+        """ Stores item under key, keeping the byte count current,
+            to expire after ttl seconds (default: the cache's ttl)
+        """
+        if key not in self.cache_data:
+            self.inserts += 1
+        self.cache_data[key] = item
+        if self.max_bytes is not None:
+            self.current_bytes += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is None:
+            if self.expires:
+                self.expires.pop(key, None)
+            return
+        deadline = self.clock() + ttl
+        self.expires[key] = deadline
+        if self.wheel is None:
+            self.wheel = TimingWheel()
+        self.wheel.schedule(key, deadline)
+
+    def expire(self, key):
+        """ Drops key if its deadline has passed
+        """
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= self.clock():
+            self.drop_expired(key)
+
+    def sweep(self, budget=None):
+        """ Drops expired keys, doing at most budget units of work
+        """
+        if self.wheel is None:
+            return
+        if budget is None:
+            budget = self.SWEEP_BUDGET
+        for key, deadline in self.wheel.due(self.clock(), budget):
+            if self.expires.get(key) == deadline:
+                self.drop_expired(key)
+
+    def drop_expired(self, key):
+        """ Removes an expired key, telling listeners about it
+        """
+        item = self.cache_data.get(key)
+        deadline = self.expires.get(key)
+        self.delete(key)
+        self.expirations += 1
+        if self.listeners:
+            self.notify(key, item, "expired", deadline)
+
+    def delete(self, key):
+        """ Removes key from the cache, if present
+        """
+        if key in self.cache_data:
+            del self.cache_data[key]
+            if self.max_bytes is not None:
+                self.current_bytes -= self.sizes.pop(key, 0)
+            if self.expires:
+                self.expires.pop(key, None)
+
+    def discard(self, key, item=None, deadline=None):
+        """ Accounts for a key, and the item it held, that its
+            policy has evicted. A policy that deleted the key first
+            passes the deadline it had in expires
+        """
+        if self.max_bytes is not None:
+            self.current_bytes -= self.sizes.pop(key, 0)
+        if self.expires:
+            deadline = self.expires.pop(key, deadline)
+        self.evictions += 1
+        if self.listeners:
+            self.notify(key, item, "evicted", deadline)
+
+    def notify(self, key, item, reason, deadline=None):
+        """ Queues an eviction for the listeners, delivering the
+            queue once it holds evict_batch of them
+        """
+        self.pending.append((key, item, reason, deadline))
+        if len(self.pending) >= self.evict_batch:
+            self.flush_evictions()
+
+    def flush_evictions(self):
+        """ Delivers every queued eviction to every listener
+        """
+        pending, self.pending = self.pending, []
+        for on_evict in self.listeners:
+            for key, item, reason, deadline in pending:
+                on_evict(key, item, reason, deadline)
+
+    def subscribe(self, on_evict, batch=1):
+        """ Calls on_evict(key, item, reason, deadline) for each key
+            evicted ("evicted") or expired ("expired"), deadline being
+            the clock() time it was due to expire, or None. Queues
+            batch of them between deliveries
+        """
+        self.listeners.append(on_evict)
+        self.evict_batch = batch
+
+    def unsubscribe(self, on_evict):
+        """ Delivers queued evictions, then stops calling on_evict
+        """
+        self.flush_evictions()
+        self.listeners.remove(on_evict)
+
+    def track_latency(self):
+        """ Times every later get, for the average in stats()
+        """
+        if "get" in vars(self):
+            return
+        get = self.get
+        clock = time.perf_counter
+
+        def timed_get(key):
+            """ get, timed
+            """
+            began = clock()
+            try:
+                return get(key)
+            finally:
+                self.get_time += clock() - began
+                self.timed_gets += 1
+
+        self.get = timed_get
+
+    def stats(self):
+        """ Counters since the cache was created
+        """
+        reads = self.hits + self.misses
+        return {
+            "items": len(self.cache_data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / reads if reads else 0.0,
+            "inserts": self.inserts,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "avg_get_us": (self.get_time / self.timed_gets * 1e6
+                           if self.timed_gets else None),
+        }
+
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache
         """
         raise NotImplementedError("put must be implemented in your cache class")
@@ -30,3 +314,89 @@ class BaseCaching():
         """ Get an item by key
         """
         raise NotImplementedError("get must be implemented in your cache class")
+
+    def entries(self):
+        """ (key, item, meta) for every entry, in the order that
+            rebuilds the policy's state when put back one by one
+        """
+        return [(key, item, None) for key, item in self.cache_data.items()]
+
+    def restore(self, key, meta):
+        """ Reapplies the meta that entries() gave for a key which
+            has just been put back
+        """
+
+    def snapshot(self):
+        """ entries() with the seconds each has left to live (None
+            for no expiry), leaving out expired ones
+        """
+        now = self.clock()
+        records = []
+        for key, item, meta in self.entries():
+            deadline = self.expires.get(key)
+            if deadline is None:
+                records.append((key, item, meta, None))
+            elif deadline > now:
+                records.append((key, item, meta, deadline - now))
+        return records
+
+    def reload(self, key, item, meta, ttl):
+        """ Puts back one dumped entry
+        """
+        self.put(key, item, ttl)
+        if meta is not None and key in self.cache_data:
+            self.restore(key, meta)
+
+    def dump(self, path):
+        """ Saves the entries and their policy metadata to path. The
+            cache is only read while taking the snapshot; pickling
+            and writing happen afterwards
+        """
+        write_dump(path, type(self).__name__, self.snapshot())
+
+    def load(self, path):
+        """ Puts back the entries dumped to path, oldest first, and
+            returns how many were read
+        """
+        count = 0
+        for key, item, meta, ttl in read_dump(path):
+            self.reload(key, item, meta, ttl)
+            count += 1
+        return count
+
+    def lookup(self, keys, touch=None):
+        """ The cached items among keys, read with one dict pass
+            after expiring stale keys. Counts hits and misses, and
+            calls touch(key) for each hit in the order given
+        """
+        keys = list(keys)
+        if self.expires:
+            for key in keys:
+                self.expire(key)
+        data = self.cache_data
+        found = {key: data[key] for key in keys if key in data}
+        hits = 0
+        for key in keys:
+            if key in found:
+                hits += 1
+                if touch is not None:
+                    touch(key)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def get_many(self, keys):
+        """ Get the cached items among keys, as a dict by key
+        """
+        found = {}
+        for key in keys:
+            item = self.get(key)
+            if item is not None:
+                found[key] = item
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """ Add every item of mapping in the cache
+        """
+        for key, item in mapping.items():
+            self.put(key, item, ttl)
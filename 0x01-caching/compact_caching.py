@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Module for an LFU cache stored in a preallocated, array-backed
+linked list instead of a dict of OrderedDicts.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from base_caching import BaseCaching
+
+
+SLOT_TYPE = 'i'
+
+
+class SlotList(MutableMapping):
+    """An ordered mapping kept in numbered slots. Slot i holds
+       keys_at[i] and items_at[i], and links to its neighbours
+       through the integer arrays prev[i] and next[i]. Slot 0 is the
+       sentinel closing the ring: next[0] is the first key, prev[0]
+       the last. A dict maps each key to its slot.
+
+       Slots are allocated up front and reused when keys leave, so
+       steady churn allocates nothing. The list doubles when it runs
+       out. Like OrderedDict, it has move_to_end and popitem(last).
+    """
+    HEAD = 0
+
+    def __init__(self, capacity=0):
+        """Creates an empty list with capacity free slots.
+        """
+        self.prev = array(SLOT_TYPE, [0])
+        self.next = array(SLOT_TYPE, [0])
+        self.keys_at = [None]
+        self.items_at = [None]
+        self.columns = []
+        self.free = []
+        self.slots = {}
+        self.grow(capacity)
+
+    def grow(self, count):
+        """Adds count free slots.
+        """
+        start = len(self.next)
+        zeros = array(SLOT_TYPE, [0]) * count
+        self.prev.extend(zeros)
+        self.next.extend(zeros)
+        self.keys_at.extend([None] * count)
+        self.items_at.extend([None] * count)
+        for column in self.columns:
+            column.extend(array(column.typecode, [0]) * count)
+        self.free.extend(range(start + count - 1, start - 1, -1))
+
+    def add_column(self, typecode):
+        """Returns an array holding one more number per slot, which
+           grows along with the list.
+        """
+        column = array(typecode, [0]) * len(self.next)
+        self.columns.append(column)
+        return column
+
+    def link_after(self, slot, anchor):
+        """Links an unlinked slot right after anchor.
+        """
+        after = self.next[anchor]
+        self.prev[slot] = anchor
+        self.next[slot] = after
+        self.next[anchor] = slot
+        self.prev[after] = slot
+
+    def unlink(self, slot):
+        """Takes a slot out of the ring, leaving its contents.
+        """
+        before = self.prev[slot]
+        after = self.next[slot]
+        self.next[before] = after
+        self.prev[after] = before
+
+    def __len__(self):
+        """Number of keys held.
+        """
+        return len(self.slots)
+
+    def __contains__(self, key):
+        """Whether key is held.
+        """
+        return key in self.slots
+
+    def __iter__(self):
+        """Yields the keys from first to last.
+        """
+        slot = self.next[self.HEAD]
+        while slot != self.HEAD:
+            yield self.keys_at[slot]
+            slot = self.next[slot]
+
+    def __getitem__(self, key):
+        """Returns the item under key.
+        """
+        return self.items_at[self.slots[key]]
+
+    def get(self, key, default=None):
+        """Returns the item under key, or default.
+        """
+        slot = self.slots.get(key)
+        if slot is None:
+            return default
+        return self.items_at[slot]
+
+    def __setitem__(self, key, item):
+        """Replaces the item of a held key in place, or adds key
+           last.
+        """
+        slot = self.slots.get(key)
+        if slot is not None:
+            self.items_at[slot] = item
+            return
+        if not self.free:
+            self.grow(len(self.next))
+        slot = self.free.pop()
+        self.keys_at[slot] = key
+        self.items_at[slot] = item
+        self.slots[key] = slot
+        self.link_after(slot, self.prev[self.HEAD])
+
+    def __delitem__(self, key):
+        """Removes key and frees its slot.
+        """
+        slot = self.slots.pop(key)
+        self.unlink(slot)
+        self.keys_at[slot] = None
+        self.items_at[slot] = None
+        self.free.append(slot)
+
+    def move_to_end(self, key, last=True):
+        """Moves key to the end, or to the front if last is false.
+        """
+        slot = self.slots[key]
+        self.unlink(slot)
+        self.link_after(slot, self.prev[self.HEAD] if last else self.HEAD)
+
+    def popitem(self, last=True):
+        """Removes and returns the last (key, item), or the first
+           if last is false.
+        """
+        if not self.slots:
+            raise KeyError("popitem(): list is empty")
+        slot = self.prev[self.HEAD] if last else self.next[self.HEAD]
+        key = self.keys_at[slot]
+        item = self.items_at[slot]
+        del self[key]
+        return key, item
+
+
+class CompactLFUCache(BaseCaching):
+    """An LFU cache, evicting the least recently used key among
+       those with the lowest frequency, kept in a single SlotList
+       ordered by frequency and then by recency. Each key's
+       frequency is in an array column, and tails maps each
+       frequency to the last slot of its run, so every operation is
+       O(1) without a container per frequency.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Sets up the slot list, its frequency column and the run
+           tails.
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_data = SlotList(self.max_items)
+        self.freq = self.cache_data.add_column('L')
+        self.tails = {}
+
+    def __leave_run(self, slot):
+        """Updates the tail of the slot's frequency run for the slot
+           leaving it.
+        """
+        freq = self.freq[slot]
+        if self.tails[freq] != slot:
+            return
+        before = self.cache_data.prev[slot]
+        if before != SlotList.HEAD and self.freq[before] == freq:
+            self.tails[freq] = before
+        else:
+            del self.tails[freq]
+
+    def __touch(self, key):
+        """Moves a key up one frequency, to the end of its new run.
+        """
+        data = self.cache_data
+        slot = data.slots[key]
+        freq = self.freq[slot]
+        self.__leave_run(slot)
+        anchor = self.tails.get(freq + 1)
+        if anchor is None:
+            anchor = self.tails.get(freq, data.prev[slot])
+        data.unlink(slot)
+        data.link_after(slot, anchor)
+        self.freq[slot] = freq + 1
+        self.tails[freq + 1] = slot
+
+    def __insert(self, key):
+        """Places a newly stored key at the end of the frequency 0
+           run.
+        """
+        data = self.cache_data
+        slot = data.slots[key]
+        self.freq[slot] = 0
+        data.unlink(slot)
+        data.link_after(slot, self.tails.get(0, SlotList.HEAD))
+        self.tails[0] = slot
+
+    def delete(self, key):
+        """Removes key and its frequency, if present.
+        """
+        slot = self.cache_data.slots.get(key)
+        if slot is None:
+            return
+        self.__leave_run(slot)
+        super().delete(key)
+
+    def put(self, key, item, ttl=None):
+        """Adds an item to the cache. If the cache is full,
+           evicts the least frequently used item.
+        """
+        if self.wheel is not None:
+            self.expire(key)
+            self.sweep()
+        if key is None or item is None:
+            return
+        size = self.entry_size(key, item)
+        if self.too_large(size):
+            self.delete(key)
+            return
+        data = self.cache_data
+        while self.needs_room(key, size):
+            slot = data.next[SlotList.HEAD]
+            lfu_key, lfu_item = data.keys_at[slot], data.items_at[slot]
+            deadline = self.expires.get(lfu_key)
+            self.delete(lfu_key)
+            self.discard(lfu_key, lfu_item, deadline)
+        is_new = key not in data
+        self.store(key, item, size, ttl)
+        if is_new:
+            self.__insert(key)
+        else:
+            self.__touch(key)
+
+    def get(self, key):
+        """Fetches an item by key, updating its access frequency.
+        """
+        if self.expires:
+            self.expire(key)
+        item = self.cache_data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__touch(key)
+        return item
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, as a dict by key,
+           updating the frequency of each hit.
+        """
+        return self.lookup(keys, self.__touch)
+
+    def entries(self):
+        """(key, item, frequency) in list order, which is by
+           increasing frequency and then recency.
+        """
+        data = self.cache_data
+        return [(key, data[key], self.freq[data.slots[key]])
+                for key in data]
+
+    def restore(self, key, freq):
+        """Moves a key just put back to the end of the run of its
+           dumped frequency.
+        """
+        data = self.cache_data
+        slot = data.slots[key]
+        self.__leave_run(slot)
+        anchor = self.tails.get(freq)
+        if anchor is None:
+            lower = [f for f in self.tails if f < freq]
+            anchor = self.tails[max(lower)] if lower else SlotList.HEAD
+        data.unlink(slot)
+        data.link_after(slot, anchor)
+        self.freq[slot] = freq
+        self.tails[freq] = slot
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Module for thread-safe, lock-striped versions of the caching policies.
+"""
+
+import threading
+import time
+from base_caching import BaseCaching, shallow_size
+
+
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+LRUCache = __import__('3-lru_cache').LRUCache
+MRUCache = __import__('4-mru_cache').MRUCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+def summed(name):
+    """A read-only property adding up attribute name across the
+       segments of a StripedCache.
+    """
+    return property(
+        lambda self: sum(getattr(segment, name)
+                         for segment in self.segments),
+        doc="{} across all segments.".format(name))
+
+
+class StripedCache:
+    """A cache that shards keys by hash across several segments,
+       each an instance of POLICY guarded by its own lock, so that
+       threads working on different segments never wait on each
+       other. Limits are split evenly between segments and each
+       segment applies its policy to its own keys only.
+
+       It is not a BaseCaching itself: it has the public interface
+       of one (put, get, delete, bulk operations, expiry, listeners,
+       stats, dump and load), every call going to the segments, and
+       none of the helpers a policy uses internally.
+    """
+    POLICY = None
+    MAX_ITEMS = BaseCaching.MAX_ITEMS
+    SEGMENTS = 16
+
+    hits = summed("hits")
+    misses = summed("misses")
+    inserts = summed("inserts")
+    evictions = summed("evictions")
+    expirations = summed("expirations")
+    get_time = summed("get_time")
+    timed_gets = summed("timed_gets")
+
+    def __init__(self, max_items=None, max_bytes=None, sizeof=shallow_size,
+                 ttl=None, clock=time.monotonic, segments=SEGMENTS):
+        """Creates the segments and their locks.
+        """
+        self.max_items = self.MAX_ITEMS if max_items is None else max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self.clock = clock
+        self.sweeper = None
+        count = max(1, min(segments, self.max_items))
+        items, extra_items = divmod(self.max_items, count)
+        self.segments = []
+        for i in range(count):
+            seg_bytes = None
+            if max_bytes is not None:
+                seg_bytes = max_bytes // count + (i < max_bytes % count)
+            self.segments.append(self.POLICY(
+                max_items=items + (i < extra_items),
+                max_bytes=seg_bytes, sizeof=sizeof, ttl=ttl, clock=clock))
+        self.locks = [threading.Lock() for _ in self.segments]
+
+    # These only use the public interface, which the segments back.
+    stats = BaseCaching.stats
+    dump = BaseCaching.dump
+    load = BaseCaching.load
+
+    def print_cache(self):
+        """Prints a point-in-time copy of the cache, sorted by key.
+        """
+        data = self.cache_data
+        print("Current cache:")
+        for key in sorted(data):
+            print("{}: {}".format(key, data[key]))
+
+    def __segment(self, key):
+        """Returns the segment owning key and its lock.
+        """
+        i = hash(key) % len(self.segments)
+        return self.segments[i], self.locks[i]
+
+    @property
+    def cache_data(self):
+        """A point-in-time copy of every segment's items.
+        """
+        data = {}
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                data.update(segment.cache_data)
+        return data
+
+    @property
+    def current_bytes(self):
+        """Bytes held across all segments.
+        """
+        return sum(segment.current_bytes for segment in self.segments)
+
+    @property
+    def expires(self):
+        """A point-in-time copy of every segment's deadlines.
+        """
+        expires = {}
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                expires.update(segment.expires)
+        return expires
+
+    def subscribe(self, on_evict, batch=1):
+        """Subscribes on_evict to every segment. It is called with
+           the segment's lock held, from whichever thread evicted.
+        """
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                segment.subscribe(on_evict, batch)
+
+    def unsubscribe(self, on_evict):
+        """Unsubscribes on_evict from every segment.
+        """
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                segment.unsubscribe(on_evict)
+
+    def flush_evictions(self):
+        """Delivers the evictions queued in every segment.
+        """
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                segment.flush_evictions()
+
+    def track_latency(self):
+        """Times the gets of every segment, lock waits excluded.
+        """
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                segment.track_latency()
+
+    def put(self, key, item, ttl=None):
+        """Stores an item in the segment that owns its key.
+        """
+        segment, lock = self.__segment(key)
+        with lock:
+            segment.put(key, item, ttl)
+
+    def get(self, key):
+        """Returns the item for key from the segment that owns it.
+        """
+        segment, lock = self.__segment(key)
+        with lock:
+            return segment.get(key)
+
+    def __by_segment(self, keys):
+        """Groups keys by the index of the segment owning them.
+        """
+        groups = {}
+        count = len(self.segments)
+        for key in keys:
+            groups.setdefault(hash(key) % count, []).append(key)
+        return groups
+
+    def get_many(self, keys):
+        """Returns the cached items among keys, taking each
+           segment's lock once for all of its keys.
+        """
+        found = {}
+        for i, group in self.__by_segment(keys).items():
+            with self.locks[i]:
+                found.update(self.segments[i].get_many(group))
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """Stores every item of mapping, taking each segment's lock
+           once for all of its keys.
+        """
+        for i, group in self.__by_segment(mapping).items():
+            with self.locks[i]:
+                self.segments[i].put_many(
+                    {key: mapping[key] for key in group}, ttl)
+
+    def snapshot(self):
+        """Every segment's snapshot, holding one segment's lock at a
+           time.
+        """
+        records = []
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                records.extend(segment.snapshot())
+        return records
+
+    def reload(self, key, item, meta, ttl):
+        """Puts back one dumped entry into the segment owning it.
+        """
+        segment, lock = self.__segment(key)
+        with lock:
+            segment.reload(key, item, meta, ttl)
+
+    def delete(self, key):
+        """Removes key from the segment that owns it.
+        """
+        segment, lock = self.__segment(key)
+        with lock:
+            segment.delete(key)
+
+    def sweep(self, budget=None):
+        """Sweeps expired keys from each segment in turn, holding
+           one segment's lock at a time.
+        """
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                segment.sweep(budget)
+
+    def start_sweeper(self, interval=1.0, budget=None):
+        """Starts a daemon thread calling sweep every interval
+           seconds until stop_sweeper is called.
+        """
+        if self.sweeper is not None:
+            return
+        stopped = threading.Event()
+
+        def run():
+            """Sweeps until stopped.
+            """
+            while not stopped.wait(interval):
+                self.sweep(budget)
+
+        thread = threading.Thread(target=run, daemon=True)
+        self.sweeper = (thread, stopped)
+        thread.start()
+
+    def stop_sweeper(self):
+        """Stops the sweeper thread, if running.
+        """
+        if self.sweeper is not None:
+            thread, stopped = self.sweeper
+            stopped.set()
+            thread.join()
+            self.sweeper = None
+
+
+class ConcurrentFIFOCache(StripedCache):
+    """A thread-safe FIFOCache, striped across segments.
+    """
+    POLICY = FIFOCache
+
+
+class ConcurrentLIFOCache(StripedCache):
+    """A thread-safe LIFOCache, striped across segments.
+    """
+    POLICY = LIFOCache
+
+
+class ConcurrentLRUCache(StripedCache):
+    """A thread-safe LRUCache, striped across segments.
+    """
+    POLICY = LRUCache
+
+
+class ConcurrentMRUCache(StripedCache):
+    """A thread-safe MRUCache, striped across segments.
+    """
+    POLICY = MRUCache
+
+
+class ConcurrentLFUCache(StripedCache):
+    """A thread-safe LFUCache, striped across segments.
+    """
+    POLICY = LFUCache
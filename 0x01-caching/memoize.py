@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Module for a memoization decorator backed by any caching policy.
+"""
+
+import asyncio
+import functools
+from read_through import AsyncReadThrough, ReadThrough
+
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+KWARGS_MARK = object()
+FAST_TYPES = {int, str}
+
+
+class NoneResult:
+    """Stands for a None result, which no policy can store.
+    """
+
+
+NONE = NoneResult()
+
+
+class HashedKey(list):
+    """A call key that hashes its arguments only once, however many
+       times the cache looks it up.
+    """
+    __slots__ = "hashvalue"
+
+    def __init__(self, parts):
+        """Keeps parts and their hash.
+        """
+        self[:] = parts
+        self.hashvalue = hash(parts)
+
+    def __hash__(self):
+        """The hash computed at creation.
+        """
+        return self.hashvalue
+
+
+def make_key(args, kwargs, typed=False):
+    """Key for a call. With typed, arguments of different types are
+       cached apart, so f(1) and f(1.0) are two entries. A lone int
+       or str argument is its own key.
+    """
+    parts = args
+    if kwargs:
+        parts += (KWARGS_MARK,) + tuple(kwargs.items())
+    if typed:
+        parts += tuple(type(arg) for arg in args)
+        if kwargs:
+            parts += tuple(type(arg) for arg in kwargs.values())
+    elif len(parts) == 1 and type(parts[0]) in FAST_TYPES:
+        return parts[0]
+    return HashedKey(parts)
+
+
+def cached(policy=LRUCache, capacity=128, ttl=None, typed=False,
+           **options):
+    """Decorator memoizing a function in a policy(max_items=capacity,
+       **options) cache, each result kept for ttl seconds (forever if
+       None). Concurrent calls with the same arguments wait for one
+       shared call, for coroutine functions as well as plain ones.
+
+       The wrapper has cache (the policy instance), stats() and
+       cache_clear(), which also resets the stats.
+    """
+    def decorate(func):
+        """Wraps func.
+        """
+        is_async = asyncio.iscoroutinefunction(func)
+        reader = (AsyncReadThrough if is_async else ReadThrough)(
+            policy(max_items=capacity, **options), ttl)
+
+        if is_async:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                """Returns the cached result, or awaits func once.
+                """
+                async def load(key):
+                    """Awaits func, standing NONE in for None.
+                    """
+                    result = await func(*args, **kwargs)
+                    return NONE if result is None else result
+
+                result = await reader.get_or_load(
+                    make_key(args, kwargs, typed), load)
+                return None if result is NONE else result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                """Returns the cached result, or calls func once.
+                """
+                def load(key):
+                    """Calls func, standing NONE in for None.
+                    """
+                    result = func(*args, **kwargs)
+                    return NONE if result is None else result
+
+                result = reader.get_or_load(
+                    make_key(args, kwargs, typed), load)
+                return None if result is NONE else result
+
+        def stats():
+            """The stats of the function's cache.
+            """
+            return reader.cache.stats()
+
+        def cache_clear():
+            """Empties the cache and resets its stats.
+            """
+            with reader.lock:
+                reader.cache = policy(max_items=capacity, **options)
+                wrapper.cache = reader.cache
+
+        wrapper.cache = reader.cache
+        wrapper.stats = stats
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorate
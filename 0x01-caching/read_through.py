@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Module for a read-through layer over any caching policy, loading
+missing keys once however many callers ask for them at the same time.
+"""
+
+import asyncio
+import threading
+
+
+class Flight:
+    """One load in progress, which callers missing the same key
+       wait on instead of loading again.
+    """
+
+    def __init__(self):
+        """Creates a load that has not finished yet.
+        """
+        self.done = threading.Event()
+        self.item = None
+        self.error = None
+
+    def wait(self):
+        """Blocks until the load finishes, then returns its item or
+           raises its error.
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.item
+
+
+class ReadThrough:
+    """Wraps a cache so that get_or_load(key, loader) returns the
+       cached item, or calls loader(key) and caches what it returns.
+       Concurrent misses on one key share a single call of loader.
+
+       Items are kept for ttl seconds (forever if ttl is None). With
+       stale set as well, an item past its ttl is still returned for
+       up to stale more seconds while a background load refreshes
+       it. The cache holds (item, fresh_until) pairs and should only
+       be used through this layer.
+    """
+
+    def __init__(self, cache, ttl=None, stale=None):
+        """Wraps cache, a BaseCaching policy.
+        """
+        if stale is not None and ttl is None:
+            raise ValueError("stale needs a ttl")
+        self.cache = cache
+        self.ttl = ttl
+        self.stale = stale
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def lookup(self, key):
+        """Returns (item, is_stale) for a cached key, or None.
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        item, fresh_until = entry
+        return item, (fresh_until is not None and
+                      fresh_until <= self.cache.clock())
+
+    def store(self, key, item):
+        """Caches the item loader returned for key. None is not
+           cached, as no policy stores it.
+        """
+        if item is None:
+            return
+        if self.stale is None:
+            self.cache.put(key, (item, None), self.ttl)
+            return
+        fresh_until = self.cache.clock() + self.ttl
+        self.cache.put(key, (item, fresh_until), self.ttl + self.stale)
+
+    def get_or_load(self, key, loader):
+        """Returns the item for key, loading it on a miss. A stale
+           item is returned at once and refreshed in the background.
+        """
+        with self.lock:
+            found = self.lookup(key)
+        if found is not None:
+            item, is_stale = found
+            if is_stale:
+                flight, leader = self.__join(key)
+                if leader:
+                    threading.Thread(target=self.__load,
+                                     args=(key, loader, flight),
+                                     daemon=True).start()
+            return item
+        flight, leader = self.__join(key)
+        if leader:
+            self.__load(key, loader, flight)
+        return flight.wait()
+
+    def __join(self, key):
+        """Returns the flight loading key, and whether the caller
+           started it and must run the load.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self.flights[key] = Flight()
+            return flight, True
+
+    def __load(self, key, loader, flight):
+        """Runs loader for a flight, caches its item and wakes up
+           the callers waiting on it.
+        """
+        try:
+            flight.item = loader(key)
+        except Exception as error:
+            flight.error = error
+        finally:
+            with self.lock:
+                del self.flights[key]
+                if flight.error is None:
+                    self.store(key, flight.item)
+            flight.done.set()
+
+
+class AsyncReadThrough(ReadThrough):
+    """ReadThrough for asyncio, where loader(key) returns an
+       awaitable. All calls must come from one event loop.
+    """
+
+    async def get_or_load(self, key, loader):
+        """Returns the item for key, awaiting one shared load on a
+           miss. A stale item is returned at once and refreshed in
+           a background task.
+        """
+        found = self.lookup(key)
+        if found is not None:
+            item, is_stale = found
+            if is_stale:
+                self.__join(key, loader)
+            return item
+        return await asyncio.shield(self.__join(key, loader))
+
+    def __join(self, key, loader):
+        """Returns the task loading key, starting it if needed.
+        """
+        task = self.flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__load(key, loader))
+            task.add_done_callback(self.__settle)
+            self.flights[key] = task
+        return task
+
+    async def __load(self, key, loader):
+        """Awaits loader and caches its item.
+        """
+        try:
+            item = await loader(key)
+            self.store(key, item)
+            return item
+        finally:
+            del self.flights[key]
+
+    @staticmethod
+    def __settle(task):
+        """Marks a failed load's error as seen, since a background
+           refresh may have nobody awaiting it.
+        """
+        if not task.cancelled():
+            task.exception()
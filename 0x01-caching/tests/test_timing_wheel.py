@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the timing wheel sweeping expired keys.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from timing_wheel import TimingWheel  # noqa: E402
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class FakeClock:
+    """A clock that only moves when told to.
+    """
+
+    def __init__(self):
+        """Starts at time 0.
+        """
+        self.now = 0.0
+
+    def __call__(self):
+        """The current time.
+        """
+        return self.now
+
+
+class TestTimingWheel(unittest.TestCase):
+    """Tests for TimingWheel.due and the sweep built on it.
+    """
+
+    def test_later_turns_do_not_block_a_slot(self):
+        """A slot holding more later-turn entries than the budget
+           still lets its due entries and the following ticks through.
+        """
+        clock = FakeClock()
+        cache = LRUCache(max_items=64, clock=clock)
+        cache.put("A", 1, ttl=1)
+        for i in range(20):
+            cache.put("B{}".format(i), i, ttl=513)
+        cache.put("C", 1, ttl=5)
+        clock.now = 10
+        for _ in range(10):
+            cache.sweep()
+        self.assertNotIn("A", cache.cache_data)
+        self.assertNotIn("C", cache.cache_data)
+        self.assertEqual(cache.expirations, 2)
+        clock.now = 1000
+        for _ in range(200):
+            cache.sweep()
+        self.assertEqual(cache.cache_data, {})
+        self.assertEqual(cache.expirations, 22)
+        self.assertEqual(cache.wheel.size, 0)
+
+    def test_same_tick_entry_found_once_due(self):
+        """An entry not yet due in the current tick is read again
+           when it falls due, after the budget ran out mid-slot.
+        """
+        wheel = TimingWheel(resolution=1.0, slots=4)
+        for i in range(6):
+            wheel.schedule("later{}".format(i), 5.0)
+        wheel.schedule("soon", 1.5)
+        wheel.schedule("now", 1.0)
+        self.assertEqual(wheel.due(1.2, 3), [])
+        self.assertEqual(wheel.due(1.2, 8), [("now", 1.0)])
+        self.assertEqual(wheel.due(1.2, 8), [])
+        self.assertEqual(wheel.due(1.6, 8), [("soon", 1.5)])
+        found = []
+        for _ in range(4):
+            found += wheel.due(5.0, 3)
+        self.assertEqual(sorted(key for key, _ in found),
+                         ["later{}".format(i) for i in range(6)])
+        self.assertEqual(wheel.size, 0)
+
+    def test_budget_bounds_each_call(self):
+        """No call returns more entries than its budget.
+        """
+        wheel = TimingWheel()
+        for i in range(100):
+            wheel.schedule(i, i / 10)
+        self.assertEqual(len(wheel.due(50, 8)), 8)
+        found = 8
+        while wheel.size:
+            found += len(wheel.due(50, 8))
+        self.assertEqual(found, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
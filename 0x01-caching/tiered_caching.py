@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Module for a two-tier cache: any caching policy in front of a hash
+table in a memory-mapped file that every process on the host shares.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+
+HEADER = struct.Struct("<8sIII")
+MAGIC = b"L2CACHE1"
+SLOT = struct.Struct("<IQddHI")
+RETRIES = 8
+
+
+def key_hash(data):
+    """Hash of a pickled key that is the same in every process,
+       never 0, which marks an empty slot.
+    """
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest, "little") | 1
+
+
+class MappedTable:
+    """A fixed-size hash table of pickled keys and items in a file
+       mapped into memory, so it survives restarts and is shared by
+       every process opening the same path.
+
+       The table has sets of ways slots each. A key can only live in
+       the set its hash picks. When the set is full, the slot written
+       longest ago is replaced. Entries bigger than a slot are not
+       stored. Each slot starts with a version that is odd while the
+       slot is being written: readers take no lock and retry if the
+       version moved while they copied. Writers take an flock on the
+       file, and a thread lock within the process. Every write starts
+       from an odd version, so a slot a dead writer left odd is never
+       made to look stable, and opening the table empties such slots.
+    """
+
+    def __init__(self, path, sets=1024, ways=8, slot_size=512, ttl=None):
+        """Opens the table at path, creating it with the given
+           layout if the file is new. An existing file keeps its own
+           layout.
+        """
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self.fd).st_size == 0:
+                    header = HEADER.pack(MAGIC, sets, ways, slot_size)
+                    os.write(self.fd, header)
+                    os.ftruncate(self.fd, HEADER.size +
+                                 sets * ways * slot_size)
+                header = os.pread(self.fd, HEADER.size, 0)
+                magic, self.sets, self.ways, self.slot_size = \
+                    HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError("{} is not a cache table".format(path))
+                self.map = mmap.mmap(self.fd, 0)
+                self.__repair()
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(self.fd)
+            raise
+        self.view = memoryview(self.map)
+
+    def close(self):
+        """Unmaps and closes the file.
+        """
+        self.view.release()
+        self.map.close()
+        os.close(self.fd)
+
+    def __repair(self):
+        """Empties the slots a writer left odd by dying mid-write.
+           Called under the flock, so no live writer holds one.
+        """
+        end = HEADER.size + self.sets * self.ways * self.slot_size
+        for offset in range(HEADER.size, end, self.slot_size):
+            version = SLOT.unpack_from(self.map, offset)[0]
+            if version & 1:
+                SLOT.pack_into(self.map, offset, self.__next(version),
+                               0, 0.0, 0.0, 0, 0)
+
+    @staticmethod
+    def __next(version):
+        """The version after version, wrapping around to 0.
+        """
+        return (version + 1) & 0xFFFFFFFF
+
+    def __begin(self, offset):
+        """Marks a slot as being written, with an odd version
+           whatever state it was left in, and returns that version.
+        """
+        start = SLOT.unpack_from(self.map, offset)[0] | 1
+        struct.pack_into("<I", self.map, offset, start)
+        return start
+
+    def __slots(self, hashed):
+        """Offsets of the slots of the set a hash picks, from the
+           bits above the lowest, which key_hash always sets.
+        """
+        first = HEADER.size + ((hashed >> 1) % self.sets) * self.ways * \
+            self.slot_size
+        return range(first, first + self.ways * self.slot_size,
+                     self.slot_size)
+
+    def __read(self, offset):
+        """A consistent copy of a slot's header and payload, or None
+           if writers kept changing it.
+        """
+        for _ in range(RETRIES):
+            version = SLOT.unpack_from(self.map, offset)[0]
+            if version & 1:
+                continue
+            data = bytes(self.view[offset:offset + self.slot_size])
+            if SLOT.unpack_from(self.map, offset)[0] == version:
+                return data
+        return None
+
+    def get(self, key):
+        """Returns the item stored for key, or None.
+        """
+        found = self.lookup(key)
+        return None if found is None else found[0]
+
+    def lookup(self, key):
+        """Returns (item, expires) for a stored key, expires being
+           the time.time() it expires at or 0 for never, or None.
+        """
+        data = pickle.dumps(key)
+        hashed = key_hash(data)
+        for offset in self.__slots(hashed):
+            if SLOT.unpack_from(self.map, offset)[1] != hashed:
+                continue
+            slot = self.__read(offset)
+            if slot is None:
+                continue
+            _, slot_hash, _, expires, key_len, item_len = \
+                SLOT.unpack_from(slot)
+            start = SLOT.size + key_len
+            if slot_hash != hashed or slot[SLOT.size:start] != data:
+                continue
+            if expires and expires <= time.time():
+                break
+            self.hits += 1
+            return pickle.loads(slot[start:start + item_len]), expires
+        self.misses += 1
+        return None
+
+    def put(self, key, item, ttl=None):
+        """Stores item under key for ttl seconds (default: the
+           table's ttl). Returns whether it fit in a slot.
+        """
+        data = pickle.dumps(key)
+        payload = data + pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if SLOT.size + len(payload) > self.slot_size:
+            return False
+        hashed = key_hash(data)
+        if ttl is None:
+            ttl = self.ttl
+        now = time.time()
+        expires = now + ttl if ttl is not None else 0.0
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                offset = self.__victim(hashed, data, now)
+                start = self.__begin(offset)
+                self.map[offset + SLOT.size:
+                         offset + SLOT.size + len(payload)] = payload
+                SLOT.pack_into(self.map, offset, self.__next(start), hashed,
+                               now, expires, len(data),
+                               len(payload) - len(data))
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return True
+
+    def __victim(self, hashed, data, now):
+        """Slot to write key to: its own, else an empty or expired
+           one, else the one written longest ago.
+        """
+        oldest = None
+        for offset in self.__slots(hashed):
+            _, slot_hash, written, expires, key_len, _ = \
+                SLOT.unpack_from(self.map, offset)
+            if slot_hash == hashed and self.map[
+                    offset + SLOT.size:offset + SLOT.size + key_len] == data:
+                return offset
+            if slot_hash == 0 or (expires and expires <= now):
+                return offset
+            if oldest is None or written < oldest[0]:
+                oldest = (written, offset)
+        return oldest[1]
+
+    def delete(self, key):
+        """Removes key, if stored.
+        """
+        data = pickle.dumps(key)
+        hashed = key_hash(data)
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                for offset in self.__slots(hashed):
+                    _, slot_hash, _, _, key_len, _ = \
+                        SLOT.unpack_from(self.map, offset)
+                    start = offset + SLOT.size
+                    if slot_hash == hashed and \
+                            self.map[start:start + key_len] == data:
+                        version = self.__begin(offset)
+                        SLOT.pack_into(self.map, offset, self.__next(version),
+                                       0, 0.0, 0.0, 0, 0)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+class TieredCache:
+    """An L1 caching policy in front of an L2 MappedTable. Keys the
+       L1 policy evicts are demoted to L2, and L2 hits are promoted
+       back into L1. With write_through, every put also goes to L2
+       so other processes see it at once.
+    """
+
+    def __init__(self, l1, l2, write_through=False):
+        """Links the tiers, listening to L1 evictions.
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.write_through = write_through
+        self.promotions = 0
+        self.demotions = 0
+        l1.subscribe(self.__demote)
+
+    def __remaining(self, deadline):
+        """Seconds an L1 entry with deadline has left: None if it
+           never expires, at most 0 once it has expired.
+        """
+        if deadline is None:
+            return None
+        return deadline - self.l1.clock()
+
+    def __demote(self, key, item, reason, deadline):
+        """Moves a key evicted from L1 down to L2, for whatever is
+           left of its ttl.
+        """
+        if reason != "evicted":
+            return
+        ttl = self.__remaining(deadline)
+        if (ttl is None or ttl > 0) and self.l2.put(key, item, ttl):
+            self.demotions += 1
+
+    def get(self, key):
+        """Returns the item for key from L1, else from L2, promoting
+           it into L1 for what is left of its L2 ttl.
+        """
+        item = self.l1.get(key)
+        if item is None and key is not None:
+            found = self.l2.lookup(key)
+            if found is not None:
+                item, expires = found
+                self.promotions += 1
+                self.l1.put(key, item,
+                            expires - time.time() if expires else None)
+        return item
+
+    def put(self, key, item, ttl=None):
+        """Stores an item in L1, and in L2 too with write_through.
+        """
+        if key is None or item is None:
+            return
+        self.l1.put(key, item, ttl)
+        if self.write_through:
+            self.l2.put(key, item, self.l1.ttl if ttl is None else ttl)
+
+    def delete(self, key):
+        """Removes key from both tiers.
+        """
+        self.l1.delete(key)
+        self.l2.delete(key)
+
+    def flush(self):
+        """Copies every unexpired L1 item to L2, for what is left of
+           its ttl, e.g. before the process exits.
+        """
+        for key, item in list(self.l1.cache_data.items()):
+            ttl = self.__remaining(self.l1.expires.get(key))
+            if ttl is None or ttl > 0:
+                self.l2.put(key, item, ttl)
+
+    def stats(self):
+        """L1 stats, with the L2 and promotion counters added.
+        """
+        stats = self.l1.stats()
+        stats.update(l2_hits=self.l2.hits, l2_misses=self.l2.misses,
+                     promotions=self.promotions, demotions=self.demotions)
+        return stats
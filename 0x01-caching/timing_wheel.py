@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Module for a hashed timing wheel used to sweep expired cache keys.
+"""
+
+
+class TimingWheel:
+    """A ring of slots, each holding the (key, deadline) pairs that
+       fall due in one tick of resolution seconds. Deadlines further
+       away than one turn of the ring wait in their slot for later
+       turns. Reading due entries is incremental: each call does at
+       most budget units of work and resumes where it stopped, at
+       tick and at cursor within the tick's slot.
+    """
+
+    def __init__(self, resolution=1.0, slots=512):
+        """Creates an empty wheel whose current tick is unset until
+           the first entry is scheduled.
+        """
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.tick = None
+        self.cursor = 0
+        self.size = 0
+
+    def __tick_of(self, deadline):
+        """Tick number a deadline falls in.
+        """
+        return int(deadline // self.resolution)
+
+    def schedule(self, key, deadline):
+        """Adds key to the slot of its deadline.
+        """
+        tick = self.__tick_of(deadline)
+        if self.tick is None or tick < self.tick:
+            self.tick = tick
+            self.cursor = 0
+        self.slots[tick % len(self.slots)].append((key, deadline))
+        self.size += 1
+
+    def due(self, now, budget):
+        """Returns up to budget (key, deadline) pairs whose deadline is
+           not after now, walking ticks up to now. Entries for a later
+           turn of the ring still use up budget once: they are moved
+           to the front of the slot, before cursor, and not read again
+           until the wheel moves on to the next tick.
+        """
+        found = []
+        if self.tick is None:
+            return found
+        now_tick = self.__tick_of(now)
+        while budget > 0 and self.size and self.tick <= now_tick:
+            slot = self.slots[self.tick % len(self.slots)]
+            if not slot:
+                budget -= 1
+            index = self.cursor
+            while index < len(slot) and budget > 0:
+                key, deadline = slot[index]
+                budget -= 1
+                if deadline <= now:
+                    found.append((key, deadline))
+                    slot[index] = slot[-1]
+                    slot.pop()
+                    self.size -= 1
+                elif self.__tick_of(deadline) > self.tick:
+                    slot[index] = slot[self.cursor]
+                    slot[self.cursor] = (key, deadline)
+                    self.cursor += 1
+                    index += 1
+                else:
+                    index += 1
+            if index < len(slot) or self.tick == now_tick:
+                break
+            self.cursor = 0
+            self.tick += 1
+        return found
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Module for replaying key traces through the caching policies and
+comparing their hit rates, throughput and latencies:
+
+    ./trace_replay.py --capacity 500 --trace zipf+scan
+    ./trace_replay.py --capacity 100,500,2000 --trace recorded.txt
+    ./trace_replay.py --policy LRU --policy mycache:MyCache --latency
+"""
+
+import argparse
+import bisect
+import json
+import random
+import time
+
+
+POLICIES = {
+    "FIFO": __import__('1-fifo_cache').FIFOCache,
+    "LIFO": __import__('2-lifo_cache').LIFOCache,
+    "LRU": __import__('3-lru_cache').LRUCache,
+    "MRU": __import__('4-mru_cache').MRUCache,
+    "LFU": __import__('100-lfu_cache').LFUCache,
+    "ARC": __import__('101-arc_cache').ARCCache,
+    "2Q": __import__('102-two_queue_cache').TwoQueueCache,
+    "W-TinyLFU": __import__('103-tinylfu_cache').TinyLFUCache,
+}
+
+
+def zipf_trace(length, keys, skew=1.0, seed=0):
+    """Keys 0..keys-1 drawn with Zipfian popularity.
+    """
+    rng = random.Random(seed)
+    weights = [1.0 / (rank ** skew) for rank in range(1, keys + 1)]
+    return rng.choices(range(keys), weights=weights, k=length)
+
+
+def scan_trace(length, start=0):
+    """A sequential scan over length keys never seen before.
+    """
+    return list(range(start, start + length))
+
+
+def zipf_scan_trace(length, keys, seed=0):
+    """Zipfian traffic interrupted by two long one-off scans, as
+       when an export job pages through everything.
+    """
+    part = length // 4
+    hot = zipf_trace(length - 2 * part, keys, seed=seed)
+    third = len(hot) // 3
+    return (hot[:third] + scan_trace(part, keys) + hot[third:2 * third] +
+            scan_trace(part, keys + part) + hot[2 * third:])
+
+
+def loop_trace(length, keys):
+    """A loop over keys, repeated until length accesses.
+    """
+    return [i % keys for i in range(length)]
+
+
+def read_trace(path):
+    """Keys from a recorded trace file, one per line.
+    """
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def synthetic_trace(name, length, keys, seed=0):
+    """Builds one of the named synthetic traces.
+    """
+    if name == "zipf":
+        return zipf_trace(length, keys, seed=seed)
+    if name == "zipf+scan":
+        return zipf_scan_trace(length, keys, seed=seed)
+    if name == "loop":
+        return loop_trace(length, keys)
+    raise ValueError("unknown trace: {}".format(name))
+
+
+def load_policy(name):
+    """A policy from POLICIES, or any BaseCaching subclass given as
+       module:Class.
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, cls = name.partition(":")
+    if not cls:
+        raise ValueError("unknown policy: {}".format(name))
+    return getattr(__import__(module), cls)
+
+
+def replay(policy, trace, capacity, timed=False):
+    """Replays trace as a read-through cache, each miss followed by
+       a put. Returns the hit rate and ops per second and, if timed,
+       a histogram of per-access latencies: a dict mapping a power
+       of two of nanoseconds to the accesses that took less than
+       that and at least half of it.
+    """
+    cache = policy(max_items=capacity)
+    get, put = cache.get, cache.put
+    histogram = {}
+    clock = time.perf_counter_ns
+    began = time.perf_counter()
+    if timed:
+        for key in trace:
+            start = clock()
+            if get(key) is None:
+                put(key, True)
+            bucket = 1 << (clock() - start).bit_length()
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+    else:
+        for key in trace:
+            if get(key) is None:
+                put(key, True)
+    elapsed = time.perf_counter() - began
+    result = {
+        "hit_rate": cache.stats()["hit_rate"],
+        "ops_per_sec": len(trace) / elapsed if elapsed else 0.0,
+    }
+    if timed:
+        result["histogram_ns"] = dict(sorted(histogram.items()))
+        result["p50_ns"] = percentile(histogram, 0.50)
+        result["p99_ns"] = percentile(histogram, 0.99)
+    return result
+
+
+def percentile(histogram, fraction):
+    """Upper bound of the histogram bucket holding the given
+       fraction of the samples.
+    """
+    total = sum(histogram.values())
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= fraction * total:
+            return bucket
+    return 0
+
+
+def hit_rate(policy, trace, capacity):
+    """Fraction of gets that hit when trace is replayed as a
+       read-through cache: each miss is followed by a put.
+    """
+    return replay(policy, trace, capacity)["hit_rate"]
+
+
+def stack_distances(trace):
+    """For each access, the number of distinct keys accessed since
+       the previous access to the same key, or None on first access.
+       A Fenwick tree over access times marks the latest access of
+       every key, so the whole trace takes O(n log n).
+    """
+    size = len(trace)
+    tree = [0] * (size + 1)
+    last = {}
+    distances = []
+
+    def add(i, delta):
+        """Adds delta at time i.
+        """
+        i += 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(i):
+        """Marks at times before i.
+        """
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    for now, key in enumerate(trace):
+        before = last.get(key)
+        if before is None:
+            distances.append(None)
+        else:
+            distances.append(prefix(now) - prefix(before + 1))
+            add(before, -1)
+        add(now, 1)
+        last[key] = now
+    return distances
+
+
+def lru_hit_rates(trace, capacities):
+    """LRU hit rates at every capacity from one pass: an access hits
+       an LRU cache of capacity c exactly when fewer than c distinct
+       keys were accessed since its key's previous access.
+    """
+    reuses = sorted(d for d in stack_distances(trace) if d is not None)
+    return {capacity: bisect.bisect_left(reuses, capacity) / len(trace)
+            if trace else 0.0 for capacity in capacities}
+
+
+def main():
+    """Replays the chosen traces and prints a hit-rate table per
+       trace, one column per capacity, and optionally latencies.
+    """
+    parser = argparse.ArgumentParser(description="Compare cache hit rates.")
+    parser.add_argument("--trace", action="append",
+                        help="zipf, zipf+scan, loop or a trace file")
+    parser.add_argument("--policy", action="append",
+                        help="a name in POLICIES or module:Class")
+    parser.add_argument("--capacity", default="500",
+                        help="comma-separated capacities")
+    parser.add_argument("--length", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", action="store_true",
+                        help="time every access at the largest capacity")
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+
+    names = args.trace or ["zipf", "zipf+scan", "loop"]
+    labels = args.policy or list(POLICIES)
+    capacities = [int(c) for c in args.capacity.split(",")]
+    width = max(12, max(len(label) for label in labels) + 1)
+    column = "{{:<{}}}".format(width)
+    report = {}
+    for name in names:
+        try:
+            trace = synthetic_trace(name, args.length, args.keys, args.seed)
+        except ValueError:
+            trace = read_trace(name)
+        print("{} ({} accesses)".format(name, len(trace)))
+        print(column.format("policy") +
+              "".join("{:>10}".format(c) for c in capacities))
+        results = report[name] = {}
+        for label in labels:
+            policy = load_policy(label)
+            if policy is POLICIES["LRU"]:
+                rates = lru_hit_rates(trace, capacities)
+            else:
+                rates = {c: hit_rate(policy, trace, c) for c in capacities}
+            results[label] = {"hit_rate": rates}
+            print(column.format(label) +
+                  "".join("{:>9.1%} ".format(rates[c]) for c in capacities))
+        if not args.latency:
+            continue
+        print(column.format("policy") + "{:>12}{:>10}{:>10}  at capacity {}"
+              .format("ops/s", "p50", "p99", capacities[-1]))
+        for label in labels:
+            timing = replay(load_policy(label), trace, capacities[-1], True)
+            results[label]["timing"] = timing
+            print(column.format(label) + "{:>12.0f}{:>8}ns{:>8}ns".format(
+                timing["ops_per_sec"], timing["p50_ns"], timing["p99_ns"]))
+            print(column.format("") + " ".join(
+                "<{}ns:{}".format(bucket, count)
+                for bucket, count in timing["histogram_ns"].items()))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
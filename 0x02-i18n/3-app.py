@@ -6,6 +6,7 @@ Template parameterization setup for a Flask application.
 import babel
 from flask import Flask, render_template, request
 from flask_babel import Babel
+from catalog import install_catalog, load_catalog
 
 
 app = Flask(__name__)
@@ -24,6 +25,7 @@ class Config:
 
 # Load configuration settings into the Flask app
 app.config.from_object(Config)
+install_catalog(app, load_catalog(app.config["LANGUAGES"]))
 
 
 @babel.localeselector
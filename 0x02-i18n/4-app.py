@@ -6,6 +6,7 @@ Enforce locale selection using a URL parameter.
 import babel
 from flask import Flask, render_template, request
 from flask_babel import Babel
+from catalog import install_catalog, load_catalog
 
 app = Flask(__name__)
 babel = Babel(app)
@@ -23,6 +24,7 @@ class Config:
 
 # Load configuration from the Config class
 app.config.from_object(Config)
+install_catalog(app, load_catalog(app.config["LANGUAGES"]))
 
 
 @babel.localeselector
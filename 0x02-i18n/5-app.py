@@ -6,6 +6,7 @@ Basic Flask application setup.
 
 from flask import Flask, render_template, request, g
 from flask_babel import Babel
+from catalog import install_catalog, load_catalog
 
 
 app = Flask(__name__)
@@ -24,6 +25,7 @@ class Config:
 
 # Apply the configuration settings to the app
 app.config.from_object(Config)
+install_catalog(app, load_catalog(app.config["LANGUAGES"]))
 
 
 # Sample user data with information on name, locale, and timezone
@@ -6,6 +6,7 @@
 
 from flask import Flask, render_template, request, g
 from flask_babel import Babel
+from catalog import install_catalog, load_catalog
 
 
 app = Flask(__name__)
@@ -22,6 +23,7 @@ class Config:
 
 # Load configuration into the app
 app.config.from_object(Config)
+install_catalog(app, load_catalog(app.config["LANGUAGES"]))
 
 
 # Dictionary representing user data with name, locale, and timezone details
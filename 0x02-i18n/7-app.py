@@ -8,7 +8,8 @@ from email import header
 import babel
 from flask import Flask, render_template, request, g
 from flask_babel import Babel
-import pytz
+from catalog import install_catalog, load_catalog
+from resolution import Resolver
 import requests
 
 
@@ -26,6 +27,7 @@ class AppConfig:
 
 
 app.config.from_object(AppConfig)
+install_catalog(app, load_catalog(app.config["LANGUAGES"]))
 
 
 user_data = {
@@ -35,6 +37,9 @@ user_data = {
     4: {"name": "Teletubby", "locale": None, "timezone": "Europe/London"},
 }
 
+resolver = Resolver(app.config["LANGUAGES"],
+                    app.config["BABEL_DEFAULT_TIMEZONE"], user_data)
+
 
 def fetch_user(user_id):
     """
@@ -59,18 +64,10 @@ def select_locale():
     """
     Determine the best language match based on user settings or request.
     """
-    locale = request.args.get("locale")
-    if locale:
-        return locale
-    user_id = request.args.get('login_as')
-    if user_id:
-        user_locale = user_data.get(int(user_id)).get('locale')
-        if user_locale in app.config['LANGUAGES']:
-            return user_locale
-    header_locale = request.headers.get('locale')
-    if header_locale:
-        return header_locale
-    return request.accept_languages.best_match(app.config['LANGUAGES'])
+    return resolver.locale(request.args.get("locale"),
+                           request.args.get("login_as"),
+                           request.headers.get("locale"),
+                           request.headers.get("Accept-Language"))
 
 
 @babel.timezoneselector
@@ -78,21 +75,9 @@ def select_timezone():
     """
     Determine the appropriate timezone from user settings or request.
     """
-    try:
-        timezone = request.args.get("timezone")
-        if timezone:
-            return pytz.timezone(timezone)
-        user_id = request.args.get("login_as")
-        if user_id:
-            user_timezone = user_data.get(int(user_id)).get('timezone')
-            if user_timezone:
-                return pytz.timezone(user_timezone)
-        header_timezone = request.headers.get("timezone")
-        if header_timezone:
-            return pytz.timezone(header_timezone)
-    except pytz.UnknownTimeZoneError:
-        return app.config.get('BABEL_DEFAULT_TIMEZONE')
-    return app.config.get('BABEL_DEFAULT_TIMEZONE')
+    return resolver.timezone(request.args.get("timezone"),
+                             request.args.get("login_as"),
+                             request.headers.get("timezone"))
 
 
 @app.route('/', methods=['GET'], strict_slashes=False)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Precompiled translation catalog shared by every worker through mmap.
+
+The .po files of all supported locales are compiled once into a single
+flat table, one row per message and one column per locale, with every
+fallback already resolved:
+
+    python3 catalog.py en,fr
+"""
+
+import ast
+import glob
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "translations")
+CATALOG_FILE = "messages.cat"
+CATALOG_MAGIC = b"I18NCAT" + sys.byteorder[0].upper().encode()
+CATALOG_HEADER = struct.Struct("<8sIIII")
+CATALOG_ALIGN = 4
+
+
+def read_po(path):
+    """
+    Returns the translated messages of a .po file as a dict from
+    msgid to msgstr, leaving out the header, fuzzy, plural and
+    context entries and messages with an empty msgstr.
+    """
+    messages = {}
+    entry = {}
+    fuzzy = False
+    translated = False
+    field = None
+
+    def flush():
+        """
+        Keeps the entry read so far if it is a plain translation.
+        """
+        if entry.get("msgid") and entry.get("msgstr") and not fuzzy \
+                and "msgctxt" not in entry and "msgid_plural" not in entry:
+            messages[entry["msgid"]] = entry["msgstr"]
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#~"):
+                continue
+            if line.startswith("#"):
+                if line.startswith("#,") and "fuzzy" in line:
+                    if translated:
+                        flush()
+                        entry = {}
+                        translated = False
+                    fuzzy = True
+                continue
+            if line.startswith('"'):
+                entry[field] += ast.literal_eval(line)
+                continue
+            keyword, _, text = line.partition(" ")
+            if keyword in ("msgctxt", "msgid") and translated:
+                flush()
+                entry = {}
+                fuzzy = False
+                translated = False
+            translated = translated or keyword.startswith("msgstr")
+            field = keyword
+            entry[field] = ast.literal_eval(text)
+    flush()
+    return messages
+
+
+def compile_catalog(translations_dir, languages, path):
+    """
+    Compiles translations_dir/<locale>/LC_MESSAGES/*.po for each
+    locale in languages into the catalog file at path. The first
+    locale is the default: a message missing in a locale resolves
+    to the default locale's text, then to the msgid itself.
+
+    Layout: header, the locale names joined by NUL, the (offset,
+    length) of each sorted msgid, the (offset, length) of each
+    message's text per locale, then the pool of UTF-8 strings,
+    each section aligned to CATALOG_ALIGN.
+    """
+    catalogs = []
+    for locale in languages:
+        messages = {}
+        pattern = os.path.join(translations_dir, locale, "LC_MESSAGES",
+                               "*.po")
+        for po in sorted(glob.glob(pattern)):
+            messages.update(read_po(po))
+        catalogs.append(messages)
+    msgids = sorted(set().union(*catalogs))
+
+    pool = bytearray()
+    interned = {}
+
+    def intern(text):
+        """
+        Offset and length of text in the pool, added once.
+        """
+        raw = text.encode("utf-8")
+        if raw not in interned:
+            interned[raw] = (len(pool), len(raw))
+            pool.extend(raw)
+        return interned[raw]
+
+    index = array("I")
+    table = array("I")
+    for msgid in msgids:
+        index.extend(intern(msgid))
+        fallback = catalogs[0].get(msgid, msgid)
+        for messages in catalogs:
+            table.extend(intern(messages.get(msgid, fallback)))
+
+    names = "\0".join(languages).encode("utf-8")
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(CATALOG_HEADER.pack(CATALOG_MAGIC, len(languages),
+                                        len(msgids), len(names),
+                                        len(pool)))
+            for raw in (names, index.tobytes(), table.tobytes()):
+                f.write(raw)
+                f.write(b"\0" * (-len(raw) % CATALOG_ALIGN))
+            f.write(pool)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class Catalog:
+    """
+    A compiled catalog mapped read-only into memory. The string
+    pool and tables stay in the shared mapping; each worker keeps
+    only a msgid-to-row dict and the texts it has looked up.
+    """
+
+    def __init__(self, path):
+        """
+        Maps the catalog file at path.
+        """
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.map)
+        magic, locales, messages, names_size, pool_size = \
+            CATALOG_HEADER.unpack_from(view)
+        if magic != CATALOG_MAGIC:
+            raise ValueError("{} is not a catalog for this machine"
+                             .format(path))
+        offset = CATALOG_HEADER.size
+        self.languages = bytes(view[offset:offset + names_size]) \
+            .decode("utf-8").split("\0")
+        offset += names_size + -names_size % CATALOG_ALIGN
+        sections = []
+        for size in (messages * 2 * 4, messages * locales * 2 * 4):
+            sections.append(view[offset:offset + size].cast("I"))
+            offset += size
+        index, self.table = sections
+        self.pool = view[offset:offset + pool_size]
+        self.columns = {locale: i for i, locale in enumerate(self.languages)}
+        self.rows = {self.__text(index, row): row for row in range(messages)}
+        self.resolved = [{} for _ in self.languages]
+
+    def __text(self, pairs, i):
+        """
+        The pool string whose (offset, length) is pair i of pairs.
+        """
+        start = pairs[2 * i]
+        return str(self.pool[start:start + pairs[2 * i + 1]], "utf-8")
+
+    def column(self, locale):
+        """
+        Column of a locale: its own, its language's for a locale
+        like fr_CA, or the default locale's.
+        """
+        column = self.columns.get(locale)
+        if column is None:
+            language = str(locale).replace("-", "_").split("_")[0]
+            column = self.columns.get(language, 0)
+        return column
+
+    def gettext(self, locale, msgid):
+        """
+        Text of msgid in locale, or msgid if it is not in the catalog.
+        Texts are decoded from the pool once per worker.
+        """
+        column = self.column(locale)
+        texts = self.resolved[column]
+        text = texts.get(msgid)
+        if text is None:
+            row = self.rows.get(msgid)
+            if row is None:
+                return msgid
+            text = self.__text(self.table, row * len(self.languages) + column)
+            texts[msgid] = text
+        return text
+
+
+def load_catalog(languages, translations_dir=TRANSLATIONS_DIR):
+    """
+    Opens translations_dir/messages.cat, compiling it first if it
+    is missing, older than a .po file or built for other languages.
+    """
+    path = os.path.join(translations_dir, CATALOG_FILE)
+    sources = glob.glob(os.path.join(translations_dir, "*", "LC_MESSAGES",
+                                     "*.po"))
+    if os.path.exists(path) and all(
+            os.path.getmtime(po) <= os.path.getmtime(path) for po in sources):
+        catalog = Catalog(path)
+        if catalog.languages == list(languages):
+            return catalog
+    compile_catalog(translations_dir, languages, path)
+    return Catalog(path)
+
+
+def install_catalog(app, catalog):
+    """
+    Makes the _ and gettext of app's templates read from catalog,
+    in the locale Flask-Babel selected for the request. Plural
+    forms are not compiled into the catalog, so ngettext keeps
+    reading Flask-Babel's translations. Call it after Babel(app),
+    which installs its own.
+    """
+    from flask_babel import get_locale, get_translations
+
+    def gettext(msgid):
+        """
+        Text of msgid in the request's locale.
+        """
+        return catalog.gettext(str(get_locale()), msgid)
+
+    def ngettext(singular, plural, n):
+        """
+        Plural form of singular for n, from Flask-Babel.
+        """
+        return get_translations().ngettext(singular, plural, n)
+
+    app.jinja_env.install_gettext_callables(gettext, ngettext, newstyle=True)
+
+
+if __name__ == "__main__":
+    languages = sys.argv[1].split(",") if len(sys.argv) > 1 else ["en", "fr"]
+    compile_catalog(TRANSLATIONS_DIR, languages,
+                    os.path.join(TRANSLATIONS_DIR, CATALOG_FILE))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Memoized locale and timezone selection for the i18n apps.
+
+A request's locale and timezone depend only on a few strings it
+carries, so each distinct combination is resolved once and looked
+up afterwards, Accept-Language parsing and pytz lookups included.
+"""
+
+import functools
+import pytz
+from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
+
+
+class Resolver:
+    """
+    Resolves locales and timezones, remembering the last capacity
+    distinct inputs of each. Timezone names pytz does not know are
+    remembered as well, so a name like "Vulcan" raises only once.
+
+    users maps user ids to dicts with "locale" and "timezone" keys.
+    Call clear() after changing it.
+    """
+
+    def __init__(self, languages, default_timezone, users, capacity=1024):
+        """
+        Sets up the caches for the supported languages.
+        """
+        self.languages = list(languages)
+        self.default_timezone = default_timezone
+        self.users = users
+        self.locale = functools.lru_cache(capacity)(self.resolve_locale)
+        self.timezone = functools.lru_cache(capacity)(self.resolve_timezone)
+        self.zone = functools.lru_cache(capacity)(self.find_zone)
+
+    def clear(self):
+        """
+        Forgets everything resolved so far.
+        """
+        for cached in (self.locale, self.timezone, self.zone):
+            cached.cache_clear()
+
+    def user(self, user_id):
+        """
+        The user with the id given as a string, or None.
+        """
+        try:
+            return self.users.get(int(user_id))
+        except (ValueError, TypeError):
+            return None
+
+    def resolve_locale(self, query_locale, user_id, header_locale,
+                       accept_language):
+        """
+        Locale from the query string, then the user's if supported,
+        then the locale header, then the best Accept-Language match.
+        """
+        if query_locale:
+            return query_locale
+        user = self.user(user_id) if user_id else None
+        if user and user.get("locale") in self.languages:
+            return user["locale"]
+        if header_locale:
+            return header_locale
+        return parse_accept_header(accept_language, LanguageAccept) \
+            .best_match(self.languages)
+
+    def resolve_timezone(self, query_timezone, user_id, header_timezone):
+        """
+        Timezone from the query string, then the user's, then the
+        timezone header. The first name given decides: an unknown
+        one gives the default timezone.
+        """
+        user = self.user(user_id) if user_id else None
+        user_timezone = user.get("timezone") if user else None
+        for name in (query_timezone, user_timezone, header_timezone):
+            if name:
+                zone = self.zone(name)
+                return self.default_timezone if zone is None else zone
+        return self.default_timezone
+
+    @staticmethod
+    def find_zone(name):
+        """
+        The pytz timezone called name, or None if there is none.
+        """
+        try:
+            return pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            return None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the .po reader and the compiled catalog.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import Catalog, compile_catalog, read_po  # noqa: E402
+
+
+PO = r'''
+msgid ""
+msgstr ""
+"Language: fr\n"
+
+#: templates/index.html:1
+msgid "home_title"
+msgstr "Bienvenue"
+
+msgid "one_item"
+msgid_plural "many_items"
+msgstr[0] "un objet"
+msgstr[1] "des objets"
+
+#: templates/index.html:2
+msgid "home_header"
+msgstr "Bonjour "
+"monde"
+
+#, fuzzy
+msgid "draft"
+msgstr "Brouillon"
+
+msgid "after_fuzzy"
+msgstr "Apres"
+
+msgctxt "menu"
+msgid "open"
+msgstr "Ouvrir"
+
+msgid "after_context"
+msgstr "Suite"
+
+msgid "untranslated"
+msgstr ""
+
+#, fuzzy
+msgid "one_draft"
+msgid_plural "many_drafts"
+msgstr[0] "un brouillon"
+msgstr[1] "des brouillons"
+
+msgid "last"
+msgstr "Fin"
+'''
+
+
+class TestReadPo(unittest.TestCase):
+    """Tests for read_po.
+    """
+
+    def setUp(self):
+        """Writes PO to a temporary directory.
+        """
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "messages.po")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(PO)
+
+    def tearDown(self):
+        """Removes the temporary directory.
+        """
+        shutil.rmtree(self.dir)
+
+    def test_plain_entries_only(self):
+        """Keeps plain translations, including those right after a
+           plural, fuzzy or context entry, and drops the others.
+        """
+        self.assertEqual(read_po(self.path), {
+            "home_title": "Bienvenue",
+            "home_header": "Bonjour monde",
+            "after_fuzzy": "Apres",
+            "after_context": "Suite",
+            "last": "Fin",
+        })
+
+    def test_compiled_catalog(self):
+        """A catalog compiled from the file serves its texts, and the
+           msgid itself for messages it lacks.
+        """
+        locale_dir = os.path.join(self.dir, "fr", "LC_MESSAGES")
+        os.makedirs(locale_dir)
+        shutil.move(self.path, locale_dir)
+        path = os.path.join(self.dir, "messages.cat")
+        compile_catalog(self.dir, ["en", "fr"], path)
+        catalog = Catalog(path)
+        self.assertEqual(catalog.gettext("fr", "after_fuzzy"), "Apres")
+        self.assertEqual(catalog.gettext("fr_CA", "last"), "Fin")
+        self.assertEqual(catalog.gettext("en", "last"), "last")
+        self.assertEqual(catalog.gettext("fr", "draft"), "draft")
+
+
+if __name__ == "__main__":
+    unittest.main()